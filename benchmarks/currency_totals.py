@@ -0,0 +1,100 @@
+"""Time converted income/expense totals for a mixed-currency account.
+
+Run from the repository root:
+
+    python -m benchmarks.currency_totals --rows 100000 1000000
+
+Each account gets transactions in USD, EUR, GBP and INR spread over --days
+days, plus a daily rate history for the same days. The vectorized path
+(compute_summary with a RateService) is compared with converting row by
+row in Python at each transaction's rate, which also checks that both agree.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.utils.Currency import FileRateProvider, RateService
+from src.utils.Database import create_or_open_database
+from src.utils.Summary import compute_summary
+
+CURRENCIES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "INR": 83.1}
+
+
+def populate(conn, count: int, days: int) -> None:
+    rng = random.Random(count)
+    first = date(2024, 1, 1)
+    day_names = [(first + timedelta(day)).isoformat() for day in range(days)]
+    conn.execute("INSERT INTO accounts (username, password) VALUES ('bench', 'x')")
+    account_id = conn.execute("SELECT id FROM accounts WHERE username = 'bench'").fetchone()[0]
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (account_id, type, category, amount, currency, date) VALUES (?, ?, 'c', ?, ?, ?)",
+            (
+                (
+                    account_id,
+                    rng.choice(("income", "expense")),
+                    rng.randint(1, 500000),
+                    rng.choice(tuple(CURRENCIES)),
+                    rng.choice(day_names),
+                )
+                for _ in range(count)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO exchange_rate_history (base, currency, date, rate) VALUES ('USD', ?, ?, ?)",
+            [
+                (currency, day, rate * (1 + rng.uniform(-0.02, 0.02)))
+                for day in day_names
+                for currency, rate in CURRENCIES.items()
+                if currency != "USD"
+            ],
+        )
+
+
+def row_by_row_totals(conn, account_id: int) -> tuple:
+    rates = dict(
+        ((currency, day), rate)
+        for currency, day, rate in conn.execute("SELECT currency, date, rate FROM exchange_rate_history")
+    )
+    totals = {"income": 0.0, "expense": 0.0}
+    for kind, amount, currency, day in conn.execute(
+        "SELECT type, amount, currency, date FROM transactions WHERE account_id = ?", (account_id,)
+    ):
+        totals[kind] += amount / rates.get((currency, day), 1.0)
+    return round(totals["income"]), round(totals["expense"])
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--days", type=int, default=730, help="days of transactions and rate history")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'vectorized':>11} {'row by row':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.rows:
+            conn = create_or_open_database(os.path.join(directory, f"currency_{count}.db"))
+            populate(conn, count, args.days)
+            rates = RateService(FileRateProvider(os.devnull))
+            rates.load(conn)
+
+            start = time.perf_counter()
+            summary = compute_summary(conn, 1, rates, "USD")
+            vectorized = time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected = row_by_row_totals(conn, 1)
+            row_by_row = time.perf_counter() - start
+            # Float sums taken in a different order may round to a different cent.
+            got = (summary.income.cents, summary.expenses.cents)
+            assert all(abs(a - b) <= 1 for a, b in zip(got, expected)), (got, expected)
+
+            print(f"{count:>10,} {vectorized:>10.3f}s {row_by_row:>10.3f}s {row_by_row / vectorized:>7.1f}x")
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
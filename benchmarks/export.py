@@ -0,0 +1,80 @@
+"""Measure CSV export throughput and peak Python memory as an account grows.
+
+Run from the repository root:
+
+    python -m benchmarks.export --rows 100000 1000000 5000000
+
+Each size is exported twice: once timed, and once under tracemalloc to
+record the peak memory the export allocates. The peak should stay flat as
+the row count grows. Then --new rows are added and an incremental export
+timed; it should cost about the same for every account size.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from src.utils.Database import create_or_open_database
+from src.utils.Export import export_to_csv
+
+CATEGORIES = ["Salary", "Rent", "Groceries", "Transport", "Utilities", "Dining", "Savings"]
+
+
+def populate(conn, count: int, year: int = 2024) -> None:
+    rng = random.Random(count)
+    conn.execute("INSERT OR IGNORE INTO accounts (username, password) VALUES ('bench', 'x')")
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (account_id, type, category, amount, currency, date) VALUES (1, ?, ?, ?, 'USD', ?)",
+            (
+                (
+                    rng.choice(("income", "expense")),
+                    rng.choice(CATEGORIES),
+                    rng.randint(1, 500000),
+                    f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                )
+                for _ in range(count)
+            ),
+        )
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--new", type=int, default=1_000, help="rows added before the incremental export")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'time':>8} {'rows/s':>10} {'peak memory':>12} {f'+{args.new:,} incremental':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.rows:
+            conn = create_or_open_database(os.path.join(directory, f"export_{count}.db"))
+            populate(conn, count)
+
+            with open(os.devnull, "w") as quiet, redirect_stdout(quiet):
+                start = time.perf_counter()
+                export_to_csv("bench", conn, directory)
+                elapsed = time.perf_counter() - start
+
+                tracemalloc.start()
+                export_to_csv("bench", conn, directory, incremental=True)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                # Dated after everything already exported, so they can be appended.
+                populate(conn, args.new, year=2025)
+                start = time.perf_counter()
+                export_to_csv("bench", conn, directory, incremental=True)
+                appended = time.perf_counter() - start
+
+            print(
+                f"{count:>10,} {elapsed:>7.2f}s {count / elapsed:>10,.0f} {peak / 1024:>9,.0f} KiB "
+                f"{appended:>17.3f}s"
+            )
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
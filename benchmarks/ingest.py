@@ -0,0 +1,92 @@
+"""Compare bulk insert_transactions throughput with the old one-row-per-commit path.
+
+Run from the repository root:
+
+    python -m benchmarks.ingest --rows 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.utils.Database import create_or_open_database, insert_transactions
+
+CATEGORIES = ["Salary", "Rent", "Groceries", "Transport", "Utilities", "Dining", "Savings"]
+
+
+def make_rows(count: int, account: str) -> list:
+    rng = random.Random(count)
+    return [
+        {
+            "account": account,
+            "type": rng.choice(("income", "expense")),
+            "category": rng.choice(CATEGORIES),
+            "amount": f"{rng.randint(1, 500000) / 100:.2f}",
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for _ in range(count)
+    ]
+
+
+def open_fresh_database(directory: str, name: str):
+    conn = create_or_open_database(os.path.join(directory, name))
+    conn.execute("INSERT INTO accounts (username, password) VALUES ('bench', 'x')")
+    conn.commit()
+    return conn
+
+
+def bench_row_per_commit(conn, rows: list) -> float:
+    """The path add_income/add_expense used before: one INSERT and commit per row."""
+    start = time.perf_counter()
+    for row in rows:
+        account_id = conn.execute("SELECT id FROM accounts WHERE username = ?", (row["account"],)).fetchone()[0]
+        conn.execute(
+            "INSERT INTO transactions (account_id, type, category, amount, date) VALUES (?, ?, ?, ?, ?)",
+            (account_id, row["type"], row["category"], int(float(row["amount"]) * 100), row["date"]),
+        )
+        conn.commit()
+    return time.perf_counter() - start
+
+
+def bench_bulk(conn, rows: list) -> float:
+    start = time.perf_counter()
+    inserted, errors = insert_transactions(conn, rows)
+    elapsed = time.perf_counter() - start
+    assert inserted == len(rows) and not errors, errors[:5]
+    return elapsed
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=2_000,
+        help="rows timed on the row-per-commit path (it is extrapolated beyond this)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'row/commit rows/s':>18} {'bulk rows/s':>12} {'bulk time':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.rows:
+            rows = make_rows(count, "bench")
+
+            legacy_rows = rows[: args.legacy_limit]
+            conn = open_fresh_database(directory, f"legacy_{count}.db")
+            legacy_rate = len(legacy_rows) / bench_row_per_commit(conn, legacy_rows)
+            conn.close()
+
+            conn = open_fresh_database(directory, f"bulk_{count}.db")
+            bulk_time = bench_bulk(conn, rows)
+            conn.close()
+
+            bulk_rate = count / bulk_time
+            print(
+                f"{count:>10} {legacy_rate:>18,.0f} {bulk_rate:>12,.0f} {bulk_time:>9.2f}s {bulk_rate / legacy_rate:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
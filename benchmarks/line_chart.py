@@ -0,0 +1,58 @@
+"""Compare line chart render times with and without large-series downsampling.
+
+Run from the repository root:
+
+    python -m benchmarks.line_chart --points 1000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.utils.Visualization import ChartFigure
+
+WIDTH, HEIGHT = 1200, 700
+
+
+def make_series(count: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2000-01-01") + np.arange(count)
+    cents = np.abs(rng.normal(0, 5_000, count).cumsum()).astype(np.int64) + 100
+    return dates, cents
+
+
+def bench_render(large_series_points: int, income: tuple, expenses: tuple) -> float:
+    """Time one full update and draw on a fresh figure."""
+    chart = ChartFigure(large_series_points=large_series_points)
+    chart.resize(WIDTH, HEIGHT)
+    start = time.perf_counter()
+    chart.update("line", (income, expenses))
+    chart.render()
+    return time.perf_counter() - start
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--full-limit",
+        type=int,
+        default=10_000,
+        help="largest series drawn with every point and label (slower sizes are skipped)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'points':>10} {'every point':>12} {'downsampled':>12} {'speedup':>8}")
+    for count in args.points:
+        income, expenses = make_series(count, 1), make_series(count, 2)
+
+        downsampled = bench_render(0, income, expenses)
+        if count <= args.full_limit:
+            full = bench_render(2 * count, income, expenses)
+            print(f"{count:>10} {full:>11.2f}s {downsampled:>11.2f}s {full / downsampled:>7.0f}x")
+        else:
+            print(f"{count:>10} {'skipped':>12} {downsampled:>11.2f}s {'':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Report what the app spends its cold start on.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 5
+
+The first table comes from ``python -X importtime -c "import main"`` and lists
+main's direct imports by cumulative time. The second launches the app with
+BUDGET_TRACKER_STARTUP_TIMING=exit, which prints wall-clock marks up to the
+point the login window is idle and then quits; it needs a display.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+MARK_LINE = re.compile(r"startup (.+): (\d+) ms")
+
+
+def import_times() -> list:
+    """Return (module, cumulative ms) for main and each module it imports directly."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # A module's imports are printed before it, one level (two spaces) deeper.
+    children = []
+    for match in IMPORT_LINE.finditer(result.stderr):
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 2:
+            children.append((name, int(cumulative) / 1000))
+        elif not indent:
+            if name == "main":
+                return children + [(name, int(cumulative) / 1000)]
+            children = []
+    return children
+
+
+def has_display() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+
+
+def launch_marks() -> dict:
+    """Start the app once and return its startup marks in ms since launch."""
+    env = dict(os.environ, BUDGET_TRACKER_STARTUP_TIMING="exit", BUDGET_TRACKER_LAUNCHED_AT=repr(time.time()))
+    result = subprocess.run(
+        [sys.executable, "main.py"], cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+    return {label: int(ms) for label, ms in MARK_LINE.findall(result.stdout)}
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="app launches to take the median of")
+    parser.add_argument("--top", type=int, default=12, help="imports to list")
+    args = parser.parse_args(argv)
+
+    modules = import_times()
+    total = dict(modules).get("main", 0.0)
+    print(f"import main: {total:.0f} ms")
+    for name, ms in sorted((m for m in modules if m[0] != "main"), key=lambda m: -m[1])[: args.top]:
+        print(f"  {name:<40} {ms:>7.1f} ms")
+
+    if not has_display():
+        print("No display available; skipping time to interactive login window.")
+        return
+
+    runs = [launch_marks() for _ in range(args.runs)]
+    print(f"\nmedian of {args.runs} launches (ms since launch):")
+    for label in runs[0]:
+        print(f"  {label:<20} {statistics.median(run[label] for run in runs if label in run):>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
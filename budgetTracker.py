@@ -1,5 +1,7 @@
+import importlib
+import os
 import sqlite3
-import requests
+import time
 import customtkinter as ctk
 from datetime import datetime
 
@@ -12,15 +14,49 @@ from src.utils.Components import (
 )
 from src.utils.Database import (
     create_or_open_database,
+    QueryCache,
+    TIME_BUCKETS,
     get_account_id,
-    create_user_account,
-    validate_user,
+    insert_transactions,
+    hash_password,
+    verify_password,
+    password_needs_rehash,
+    fetch_password_hash,
+    store_user_account,
+    update_password_hash,
 )
-from src.utils.Export import export_to_csv
-from src.utils.Visualization import plot_bar_chart, plot_pie_chart, plot_line_chart
+from src.utils.Currency import BASE_CURRENCY, SUPPORTED_CURRENCIES, RateService, default_provider
+from src.utils.Notifications import NotificationManager
+from src.utils.Session import Session
+from src.utils.Summary import compute_summary, compute_time_series
+from src.utils.Tasks import TaskRunner
+
+# matplotlib (via Visualization), requests and the CSV exporter are imported
+# on first use; together they cost more than everything else at startup.
+
+# "1" prints wall-clock startup marks; "exit" also quits once the login window is idle.
+STARTUP_TIMING = os.environ.get("BUDGET_TRACKER_STARTUP_TIMING")
+_startup_marks = []
+
+
+def mark_startup(label: str) -> None:
+    """Record a startup milestone when startup timing is enabled."""
+    if STARTUP_TIMING:
+        _startup_marks.append((label, time.time()))
+
+
+def report_startup(root) -> None:
+    """Print the startup marks, in ms since launch when the launcher exported its start time."""
+    mark_startup("interactive")
+    origin = float(os.environ.get("BUDGET_TRACKER_LAUNCHED_AT") or _startup_marks[0][1])
+    for label, timestamp in _startup_marks:
+        print(f"startup {label}: {1000 * (timestamp - origin):.0f} ms")
+    if STARTUP_TIMING == "exit":
+        root.destroy()
 
 
 class BudgetTrackerApp:
+    DB_NAME = "budget_tracker.db"
     PAGES = [
         "User Authentication",
         "Income",
@@ -36,16 +72,30 @@ class BudgetTrackerApp:
         self.root.geometry("1000x600")
 
         self.root.iconbitmap("Icon.ico")
+        self._auth_in_progress = False
+        self.session = None
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("dark-blue")
+        self.notifications = NotificationManager(self.root)
+
+        # Queries, exports and password hashing run here, off the Tk thread.
+        self.tasks = TaskRunner(self.root, self.DB_NAME)
 
         try:
-            self.db = create_or_open_database("budget_tracker.db")
+            self.db = create_or_open_database(self.DB_NAME)
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
             return
+        self.query_cache = QueryCache(self.db)
+        # Conversions use the last stored rates; BUDGET_TRACKER_RATES_FILE swaps the web API for a JSON file.
+        self.rates = RateService(default_provider(os.environ.get("BUDGET_TRACKER_RATES_FILE")))
+        self.rates.load(self.db)
+        mark_startup("database")
 
         self.setup_ui()
+        mark_startup("login page")
+        if STARTUP_TIMING:
+            self.root.after_idle(report_startup, self.root)
 
     def setup_ui(self):
         # Create main layout
@@ -67,18 +117,19 @@ class BudgetTrackerApp:
         # Disable all buttons except User Authentication initially
         self.update_sidebar_buttons("User Authentication")
 
-        # Create pages
+        # Create pages; each one's widgets are built the first time it is shown
         self.pages = {}
         for page in self.PAGES:
             self.pages[page] = ctk.CTkFrame(self.main_content)
-
-        # Setup individual pages
-        self.setup_authentication_page()
-        self.setup_income_page()
-        self.setup_expense_page()
-        self.setup_visualization_page()
-        self.setup_summary_page()
-        self.setup_budget_analysis_page()
+        self.page_builders = {
+            "User Authentication": self.setup_authentication_page,
+            "Income": self.setup_income_page,
+            "Expenses": self.setup_expense_page,
+            "Visualization": self.setup_visualization_page,
+            "Summary": self.setup_summary_page,
+            "Budget Analysis": self.setup_budget_analysis_page,
+        }
+        self.built_pages = set()
 
         # Show initial page
         self.show_page("User Authentication")
@@ -88,6 +139,9 @@ class BudgetTrackerApp:
         self.notification_label.pack(side="bottom", pady=5)
 
     def show_page(self, page_name):
+        if page_name not in self.built_pages:
+            self.page_builders[page_name]()
+            self.built_pages.add(page_name)
         for page in self.pages.values():
             page.pack_forget()
         self.pages[page_name].pack(fill="both", expand=True)
@@ -160,8 +214,8 @@ class BudgetTrackerApp:
         income_account_entry = create_labeled_entry(page, "Account Name")
         income_category_entry = create_labeled_entry(page, "Category")
         income_amount_entry = create_labeled_entry(page, "Amount")
+        income_currency_var = create_dropdown(page, SUPPORTED_CURRENCIES, default=BASE_CURRENCY)
         #income_date_entry = create_labeled_entry(page, "Date (YYYY-MM-DD)")
-        current_date = datetime.now().strftime("%d/%m/%Y")
 
         create_button(
             page,
@@ -170,7 +224,8 @@ class BudgetTrackerApp:
                 income_account_entry.get(),
                 income_category_entry.get(),
                 income_amount_entry.get(),
-                current_date,
+                datetime.now().strftime("%Y-%m-%d"),
+                income_currency_var.get(),
             ),
         )
 
@@ -180,8 +235,8 @@ class BudgetTrackerApp:
         expense_account_entry = create_labeled_entry(page, "Account Name")
         expense_category_entry = create_labeled_entry(page, "Category")
         expense_amount_entry = create_labeled_entry(page, "Amount")
+        expense_currency_var = create_dropdown(page, SUPPORTED_CURRENCIES, default=BASE_CURRENCY)
         #expense_date_entry = create_labeled_entry(page, "Date (YYYY-MM-DD)")
-        current_date = datetime.now().strftime("%d/%m/%Y")
 
         create_button(
             page,
@@ -190,7 +245,8 @@ class BudgetTrackerApp:
                 expense_account_entry.get(),
                 expense_category_entry.get(),
                 expense_amount_entry.get(),
-                current_date,
+                datetime.now().strftime("%Y-%m-%d"),
+                expense_currency_var.get(),
             ),
         )
 
@@ -240,7 +296,7 @@ class BudgetTrackerApp:
         input_frame.grid(row=2, column=0, sticky="nsew", padx=20, pady=5)
         
         input_frame.grid_columnconfigure(0, weight=1)
-        input_frame.grid_columnconfigure(1, weight=0) 
+        input_frame.grid_columnconfigure((1, 2), weight=0) 
         input_frame.grid_rowconfigure(0, minsize=70)
         
         self.viz_account_entry = ctk.CTkEntry(
@@ -250,6 +306,18 @@ class BudgetTrackerApp:
             font=ctk.CTkFont(family="Arial", size=-12)
         )
         self.viz_account_entry.grid(row=0, column=0, padx=(20, 10), pady=17, sticky="ew")
+
+        # Time bucket for the line chart
+        self.granularity_var = ctk.StringVar(value="Day")
+        granularity_selector = ctk.CTkSegmentedButton(
+            input_frame,
+            values=[bucket.title() for bucket in TIME_BUCKETS],
+            variable=self.granularity_var,
+            command=self.on_granularity_change,
+            height=35,
+            font=ctk.CTkFont(family="Arial", size=-12, weight="bold")
+        )
+        granularity_selector.grid(row=0, column=1, padx=(0, 10), pady=17)
         
         update_btn = ctk.CTkButton(
             input_frame,
@@ -259,7 +327,7 @@ class BudgetTrackerApp:
             width=120,
             font=ctk.CTkFont(family="Arial", size=-12, weight="bold")
         )
-        update_btn.grid(row=0, column=1, padx=(0, 20), pady=17)
+        update_btn.grid(row=0, column=2, padx=(0, 20), pady=17)
        
         self.chart_frame = ctk.CTkFrame(
             page,
@@ -270,12 +338,13 @@ class BudgetTrackerApp:
         
         self.chart_frame.grid_columnconfigure(0, weight=2)
         self.chart_frame.grid_rowconfigure(0, weight=2)
-        
-        def on_resize(event):
-            if hasattr(self, 'current_chart'):
-                self.update_chart_with_debounce()
-        
-        self.chart_frame.bind('<Configure>', on_resize)
+
+        self.chart_loading_label = ctk.CTkLabel(
+            self.chart_frame,
+            text="Loading...",
+            font=("Arial", 14),
+            text_color="white"
+        )
 
     def create_responsive_chart_card(self, parent, title, description, command, chart_type):
         card = ctk.CTkFrame(
@@ -295,7 +364,8 @@ class BudgetTrackerApp:
             if self.active_chart_var.get() != chart_type:
                 self.active_chart_var.set(chart_type)
                 self.update_card_styles()
-                self.update_chart_with_debounce()
+                # Not debounced: a chart already rendered for this data is shown straight from the cache.
+                self.update_active_chart(self.viz_account_entry.get())
         
         card.bind("<Button-1>", on_click)
         
@@ -339,31 +409,64 @@ class BudgetTrackerApp:
         if not account_name:
             self.show_notification("Please enter an account name", "error")
             return
-            
-        try:
-            chart_type = self.active_chart_var.get()
-            for widget in self.chart_frame.winfo_children():
-                widget.destroy()
-            loading_label = ctk.CTkLabel(
-                self.chart_frame,
-                text="Loading...",
-                font=("Arial", 14),
-                text_color="white"
-            )
-            loading_label.pack(expand=True)
-            self.chart_frame.update()
-            if chart_type == "bar":
-                self.show_bar_chart(account_name)
-            elif chart_type == "pie":
-                self.show_pie_chart(account_name)
-            elif chart_type == "line":
-                self.show_line_chart(account_name)
-                
-        except Exception as e:
+
+        chart_type = self.active_chart_var.get()
+        bucket = self.granularity_var.get().lower() if chart_type == "line" else None
+        self.rates.refresh_in_background(self.tasks)
+        # The token moves with every commit from any connection, so a cached bitmap is never stale.
+        cache_key = (account_name, chart_type, bucket, self.query_cache.data_token())
+        from src.utils.Visualization import show_cached_chart
+
+        if show_cached_chart(self.chart_frame, cache_key):
+            self.tasks.cancel("chart")
+            self.chart_loading_label.place_forget()
+            return
+
+        # The chart surface is reused between updates, so overlay the label instead of clearing the frame.
+        self.chart_loading_label.place(relx=0.5, rely=0.5, anchor="center")
+        self.chart_loading_label.lift()
+
+        def on_success(data):
+            self.chart_loading_label.place_forget()
+            self.render_chart(chart_type, data, cache_key)
+
+        def on_error(e):
+            self.chart_loading_label.place_forget()
             self.show_notification(f"Error updating chart: {str(e)}", "error")
-        finally:
-            if 'loading_label' in locals():
-                loading_label.destroy()
+
+        # Only the newest chart request is drawn; older ones are dropped.
+        self.tasks.submit(
+            lambda task: self.load_chart_data(chart_type, account_name, task.cache, bucket),
+            on_success,
+            on_error,
+            key="chart",
+        )
+
+    def on_granularity_change(self, value):
+        account_name = self.viz_account_entry.get()
+        if self.active_chart_var.get() == "line" and account_name:
+            self.update_active_chart(account_name)
+
+    def load_chart_data(self, chart_type, account_name, cache, bucket=None):
+        """Fetch the data for a chart type. Runs on a worker thread."""
+        if chart_type == "bar":
+            return self.get_income_data(account_name, cache)
+        if chart_type == "pie":
+            return self.get_expense_data(account_name, cache)
+        return self.get_time_series_data(account_name, bucket or "day", cache)
+
+    def render_chart(self, chart_type, chart_data, cache_key=None):
+        from src.utils.Visualization import plot_bar_chart, plot_pie_chart, plot_line_chart
+
+        if chart_type == "bar":
+            data, labels = chart_data
+            plot_bar_chart(data, labels, "Income by Category", self.chart_frame, cache_key)
+        elif chart_type == "pie":
+            data, labels = chart_data
+            plot_pie_chart(data, labels, "Expenses by Category", self.chart_frame, cache_key)
+        elif chart_type == "line":
+            income_data, expense_data = chart_data
+            plot_line_chart(income_data, expense_data, self.chart_frame, cache_key)
 
     # Summary Page 
     def setup_summary_page(self):
@@ -373,8 +476,7 @@ class BudgetTrackerApp:
         self.summary_text = create_textbox(page)
 
         # The create_dropdown function to add a currency selection dropdown
-        currency_options = ["USD", "EUR", "GBP", "INR"]
-        self.currency_var = create_dropdown(page, currency_options, default="USD")
+        self.currency_var = create_dropdown(page, SUPPORTED_CURRENCIES, default=BASE_CURRENCY)
     
         create_button(
             page,
@@ -388,25 +490,6 @@ class BudgetTrackerApp:
             lambda: self.export_all_data(summary_account_entry.get()),
         )
         
-    # Currency Conversion
-    def convert_currency(self, amount, from_currency, to_currency):
-        try:
-            # API endpoint for getting the latest rates for the from_currency
-            url = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
-            response = requests.get(url)
-            response.raise_for_status()
-
-            # Get the conversion rate for the desired currency
-            rates = response.json().get('rates', {})
-            conversion_rate = rates.get(to_currency, 1)
-
-            # Calculate the converted amount
-            converted_amount = round(amount * conversion_rate, 2)
-            return converted_amount
-        except requests.exceptions.RequestException as e:
-            self.show_notification(f"Currency conversion failed: {str(e)}", "error")
-            return amount
-
     def setup_budget_analysis_page(self):
         page = self.pages["Budget Analysis"]
 
@@ -434,11 +517,24 @@ class BudgetTrackerApp:
         """Register a new user with the given username and password."""
         if not self.is_valid_input(username, password):
             return
-        
+        if self._auth_in_progress:
+            return
+
+        # bcrypt is deliberately slow; hash on a worker so the window stays responsive.
+        self._auth_in_progress = True
+        self.tasks.submit(
+            lambda task: hash_password(password),
+            lambda hashed: self.finish_registration(username, hashed),
+            self.on_auth_error,
+            key="auth",
+        )
+
+    def finish_registration(self, username: str, hashed_password: bytes) -> None:
+        self._auth_in_progress = False
         try:
-            create_user_account(self, self.db, username, password)
+            store_user_account(self.db, username, hashed_password)
             self.show_notification("Registration successful!", "success")
-            self.register_window.destroy()
+            self.close_register_window()
             self.root.deiconify()
         except ValueError as ve:
             self.show_notification(str(ve), "error")
@@ -451,47 +547,97 @@ class BudgetTrackerApp:
         if not username or not password:
             self.show_notification("Username and password are required.", "error")
             return
-        if validate_user(self.db, username, password):
-            self.show_notification("Login successful!", "success")
-            self.update_sidebar_buttons("Income")  # Enable all buttons after login
-            self.show_page("Income")  # Show Income page after successful login
-        else:
+        if self._auth_in_progress:
+            return
+        try:
+            hashed_password = fetch_password_hash(self.db, username)
+        except sqlite3.Error as e:
+            self.show_notification(f"Database error: {e}", "error")
+            return
+        if hashed_password is None:
+            self.show_notification("Invalid username or password.", "error")
+            return
+
+        self._auth_in_progress = True
+        self.tasks.submit(
+            lambda task: verify_password(password, hashed_password),
+            lambda valid: self.finish_login(username, password, hashed_password, valid),
+            self.on_auth_error,
+            key="auth",
+        )
+
+    def finish_login(self, username, password, hashed_password, valid):
+        self._auth_in_progress = False
+        if not valid:
             self.show_notification("Invalid username or password.", "error")
+            return
 
-    def add_income(self, account_name, category, amount, date):
+        try:
+            self.session = Session(get_account_id(self.db, username), username)
+        except (ValueError, sqlite3.Error) as e:
+            self.show_notification(f"Could not start session: {e}", "error")
+            return
+
+        self.show_notification("Login successful!", "success")
+        self.update_sidebar_buttons("Income")  # Enable all buttons after login
+        self.show_page("Income")  # Show Income page after successful login
+        self.rates.refresh_in_background(self.tasks)
+        # Load the charting stack in the background so the first chart does not wait for it.
+        self.tasks.submit(lambda task: importlib.import_module("src.utils.Visualization"))
+
+        if password_needs_rehash(hashed_password):
+            # The configured work factor changed since this hash was made; upgrade it quietly.
+            self.tasks.submit(
+                lambda task: update_password_hash(task.db, username, hash_password(password)),
+                on_error=lambda e: print(f"Password rehash failed: {e}"),
+            )
+
+    def on_auth_error(self, error: Exception) -> None:
+        self._auth_in_progress = False
+        self.show_notification(f"Authentication error: {error}", "error")
+
+    def add_income(self, account_name, category, amount, date, currency=BASE_CURRENCY):
         try:
             if not account_name or not category or not amount or not date:
                 raise ValueError("All fields are required.")
-            amount = float(amount)
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-            cursor = self.db.cursor()
-            cursor.execute(
-                "INSERT INTO transactions (account_id, type, category, amount, date) VALUES (?, 'income', ?, ?, ?)",
-                (account_id, category, amount, date),
+            account_id = self.session.resolve_account(self.db, account_name)
+            _, errors = insert_transactions(
+                self.db,
+                [{
+                    "account_id": account_id,
+                    "type": "income",
+                    "category": category,
+                    "amount": amount,
+                    "date": date,
+                    "currency": currency,
+                }],
             )
-            self.db.commit()
+            if errors:
+                raise ValueError(errors[0][1])
             self.show_notification("Income added successfully.", "success")
         except ValueError as ve:
             self.show_notification(str(ve), "error")
         except Exception as e:
             self.show_notification(f"An error occurred: {str(e)}", "error")
 
-    def add_expense(self, account_name, category, amount, date):
+    def add_expense(self, account_name, category, amount, date, currency=BASE_CURRENCY):
         try:
             if not account_name or not category or not amount or not date:
                 raise ValueError("All fields are required.")
-            amount = float(amount)
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-            cursor = self.db.cursor()
-            cursor.execute(
-                "INSERT INTO transactions (account_id, type, category, amount, date) VALUES (?, 'expense', ?, ?, ?)",
-                (account_id, category, amount, date),
+            account_id = self.session.resolve_account(self.db, account_name)
+            _, errors = insert_transactions(
+                self.db,
+                [{
+                    "account_id": account_id,
+                    "type": "expense",
+                    "category": category,
+                    "amount": amount,
+                    "date": date,
+                    "currency": currency,
+                }],
             )
-            self.db.commit()
+            if errors:
+                raise ValueError(errors[0][1])
             self.show_notification("Expense added successfully.", "success")
         except ValueError as ve:
             self.show_notification(str(ve), "error")
@@ -499,79 +645,62 @@ class BudgetTrackerApp:
             self.show_notification(f"An error occurred: {str(e)}", "error")
 
     def show_bar_chart(self, account_name):
-        try:
-            data, labels = self.get_income_data(account_name)
-            plot_bar_chart(data, labels, "Income by Category", self.chart_frame)
-        except Exception as e:
-            self.show_notification(f"Error displaying chart: {str(e)}", "error")
+        self.active_chart_var.set("bar")
+        self.update_active_chart(account_name)
 
     def show_pie_chart(self, account_name):
-        try:
-            data, labels = self.get_expense_data(account_name)
-            plot_pie_chart(data, labels, "Expenses by Category", self.chart_frame)
-        except Exception as e:
-            self.show_notification(f"Error displaying chart: {str(e)}", "error")
+        self.active_chart_var.set("pie")
+        self.update_active_chart(account_name)
 
     def show_line_chart(self, account_name):
-        try:
-            income_data = self.get_income_time_data(account_name)
-            expense_data = self.get_expense_time_data(account_name)
-            plot_line_chart(income_data, expense_data, self.chart_frame)
-        except Exception as e:
-            self.show_notification(f"Error displaying chart: {str(e)}", "error")
+        self.active_chart_var.set("line")
+        self.update_active_chart(account_name)
+
+    def get_summary(self, account_name, cache=None, currency=BASE_CURRENCY):
+        """Return the AccountSummary for an account in ``currency``, each transaction at its date's rate."""
+        cache = cache or self.query_cache
+        account_id = self.session.resolve_account(cache.conn, account_name)
+        return compute_summary(cache.conn, account_id, self.rates, currency, cache=cache)
 
     # Updated Summary
     def update_summary(self, account_name, summary_text):
-        try:
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT SUM(amount) FROM transactions WHERE account_id = ? AND type = 'income'",
-                (account_id,),
-            )
-            total_income = cursor.fetchone()[0] or 0
-
-            cursor.execute(
-                "SELECT SUM(amount) FROM transactions WHERE account_id = ? AND type = 'expense'",
-                (account_id,),
-            )
-            total_expenses = cursor.fetchone()[0] or 0
-            
-            selected_currency = self.currency_var.get()
-        
-            converted_income = self.convert_currency(total_income, "USD", selected_currency)
-            converted_expenses = self.convert_currency(total_expenses, "USD", selected_currency)
-
-            update_textbox(
-                summary_text,
-                f"Total Income: {converted_income:.2f} {selected_currency}\n"
-                f"Total Expenses: {converted_expenses:.2f} {selected_currency}"
-            )
-        except Exception as e:
-            self.show_notification(f"Error updating summary: {str(e)}", "error")
+        selected_currency = self.currency_var.get()
+        self.rates.refresh_in_background(self.tasks)
+
+        def load(task):
+            try:
+                return self.get_summary(account_name, task.cache, selected_currency), None
+            except ValueError as e:
+                if selected_currency == BASE_CURRENCY:
+                    raise
+                return self.get_summary(account_name, task.cache), f"Currency conversion failed: {str(e)}"
+
+        def show(result):
+            summary, error = result
+            if error:
+                self.show_notification(error, "error")
+            currency = summary.currency
+            lines = [
+                f"Total Income: {summary.income} {currency}",
+                f"Total Expenses: {summary.expenses} {currency}",
+                f"Net Income: {summary.net} {currency}",
+            ]
+            for heading, transaction_type in (("Top Income Categories", "income"), ("Top Expense Categories", "expense")):
+                top = summary.top(transaction_type)
+                if top:
+                    lines += ["", heading] + [f"  {category}: {total} {currency}" for category, total in top]
+            update_textbox(summary_text, "\n".join(lines))
+
+        self.tasks.submit(
+            load,
+            show,
+            lambda e: self.show_notification(f"Error updating summary: {str(e)}", "error"),
+            key="summary",
+        )
 
     def budget_analysis(self, account_name, analysis_text):
-        try:
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT SUM(amount) FROM transactions WHERE account_id = ? AND type = 'income'",
-                (account_id,),
-            )
-            total_income = cursor.fetchone()[0] or 0
-
-            cursor.execute(
-                "SELECT SUM(amount) FROM transactions WHERE account_id = ? AND type = 'expense'",
-                (account_id,),
-            )
-            total_expenses = cursor.fetchone()[0] or 0
-
+        def show(summary):
+            total_income, total_expenses = summary.income, summary.expenses
             if total_income > total_expenses:
                 analysis_result = "You are within your budget."
             elif total_income == total_expenses:
@@ -583,12 +712,16 @@ class BudgetTrackerApp:
                 analysis_text,
                 f"Total Income: ${total_income:.2f}\nTotal Expenses: ${total_expenses:.2f}\n{analysis_result}",
             )
-        except Exception as e:
-            self.show_notification(f"Error in budget analysis: {str(e)}", "error")
+
+        self.tasks.submit(
+            lambda task: self.get_summary(account_name, task.cache),
+            show,
+            lambda e: self.show_notification(f"Error in budget analysis: {str(e)}", "error"),
+            key="analysis",
+        )
 
     def export_all_data(self, account_name):
-        try:
-            result = export_to_csv(account_name, self.db)
+        def show(result):
             if result:
                 income_file, expenses_file, summary_file = result
                 self.show_notification(
@@ -597,147 +730,64 @@ class BudgetTrackerApp:
                 )
             else:
                 self.show_notification("Failed to export data.", "error")
-        except Exception as e:
-            self.show_notification(f"Error during export: {str(e)}", "error")
-
-    def get_income_data(self, account_name):
-        account_id = get_account_id(self.db, account_name)
-        if account_id is None:
-            raise ValueError("Account does not exist.")
-        cursor = self.db.cursor()
-        cursor.execute(
-            "SELECT category, SUM(amount) FROM transactions WHERE account_id = ? AND type = 'income' GROUP BY category",
-            (account_id,),
-        )
-        results = cursor.fetchall()
-        data = [row[1] for row in results]
-        labels = [row[0] for row in results]
-        return data, labels
-
-    def get_expense_data(self, account_name):
-        account_id = get_account_id(self.db, account_name)
-        if account_id is None:
-            raise ValueError("Account does not exist.")
-        cursor = self.db.cursor()
-        cursor.execute(
-            "SELECT category, SUM(amount) FROM transactions WHERE account_id = ? AND type = 'expense' GROUP BY category",
-            (account_id,),
-        )
-        results = cursor.fetchall()
-        data = [row[1] for row in results]
-        labels = [row[0] for row in results]
-        return data, labels
 
-    def get_income_time_data(self, account_name):
-        """Get income data for line chart"""
-        try:
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT date, SUM(amount) FROM transactions "
-                "WHERE account_id = ? AND type = 'income' "
-                "GROUP BY date ORDER BY date",
-                (account_id,)
-            )
-            results = cursor.fetchall()
-            if not results:
-                return [], []
-            
-            # Separate dates and amounts, keeping the date format as is
-            dates = [row[0] for row in results]
-            amounts = [row[1] for row in results]
-            return dates, amounts
-        except Exception as e:
-            print(f"Error getting income data: {e}")
-            return [], []
+        def export(task):
+            from src.utils.Export import export_to_csv
 
-    def get_expense_time_data(self, account_name):
-        """Get expense data for line chart"""
-        try:
-            account_id = get_account_id(self.db, account_name)
-            if account_id is None:
-                raise ValueError("Account does not exist.")
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT date, SUM(amount) FROM transactions "
-                "WHERE account_id = ? AND type = 'expense' "
-                "GROUP BY date ORDER BY date",
-                (account_id,)
-            )
-            results = cursor.fetchall()
-            if not results:
-                return [], []
-            
-            # Separate dates and amounts, keeping the date format as is
-            dates = [row[0] for row in results]
-            amounts = [row[1] for row in results]
-            return dates, amounts
-        except Exception as e:
-            print(f"Error getting expense data: {e}")
-            return [], []
+            # Repeated exports only append what was added since the last one.
+            return export_to_csv(account_name, task.db, rates=self.rates, incremental=True)
 
-    def show_notification(self, message: str, message_type: str) -> None:
-        """Display a pop-up notification in the bottom-right corner."""
-        # Create a Toplevel window (pop-up)
-        popup = ctk.CTkToplevel(self.root)
-        popup.overrideredirect(True)  # Remove window decorations (close, minimize, etc.)
-        popup.configure(fg_color="#000000")  # Set background color to black
-
-        # Create a label in the pop-up with dynamic text
-        self.notification_label = ctk.CTkLabel(
-            popup,
-            text=message,
-            text_color="white",
-            fg_color="#1E90FF",  # Blue background color
-            bg_color="#000000",   # Black background color
-            font=("Arial", 12, "bold"),  # Font style, smaller for less height
-            corner_radius=8,      # Rounded corners
-            padx=10,
-            pady=5  # Decreased padding to reduce overall height
+        self.tasks.submit(
+            export,
+            show,
+            lambda e: self.show_notification(f"Error during export: {str(e)}", "error"),
+            key="export",
         )
-        color = {
-            "error": "red",
-            "success": "green"
-        }.get(message_type, "white")
-        self.notification_label.pack(expand=True, fill="both", padx=10, pady=10)
-        self.notification_label.configure(text=message, text_color=color)
-
-        size, root_x, root_y = self.root.geometry().split('+')
-        root_x = int(root_x)
-        root_y = int(root_y)
 
-        root_w, root_h = size.split('x')
-        root_w = int(root_w)
-        root_h = int(root_h)
+    def get_income_data(self, account_name, cache=None):
+        """Income per category in BASE_CURRENCY, as the bar chart plots it."""
+        return self.get_summary(account_name, cache).category_series("income")
 
-        # Update the popup size based on the label text
-        popup.update_idletasks()  # Update "requested size" from geometry manager
-        popup_width = self.notification_label.winfo_width() + 20  # Adding padding
-        popup_height = self.notification_label.winfo_height() + 20  # Adding padding
-        popup.minsize(250, 50)  # Set minimum size for the pop-up
+    def get_expense_data(self, account_name, cache=None):
+        """Expenses per category in BASE_CURRENCY, as the pie chart plots it."""
+        return self.get_summary(account_name, cache).category_series("expense")
 
-        popup_y = root_y + (root_h - popup_height - popup_height // 2) # Almost bottom
-        popup_x = root_x + (root_w - (popup_width + 20 if popup_width >= 250 else 270)) # FIXME: why isn't popup_width the exact width?
+    def get_time_series_data(self, account_name, bucket="day", cache=None):
+        """Get per-bucket income and expense series for the line chart.
 
-        popup.geometry(f"{popup_width}x{popup_height}+{popup_x}+{popup_y}")
-
-        # Automatically destroy the pop-up after a certain duration
-        popup.after(3000, popup.destroy)  # Automatically close after 3 seconds
-
-        # Bind the resize event of the main window to update the position
-        def update_popup_position(event):
-            popup.geometry(f"{popup_width}x{popup_height}+{popup_x}+{popup_y}")
+        Both series share one gap-filled date axis and are in BASE_CURRENCY; a
+        series with no transactions at all is returned empty so it is not drawn.
+        """
+        cache = cache or self.query_cache
+        try:
+            account_id = self.session.resolve_account(cache.conn, account_name)
+            dates, income, expenses = compute_time_series(cache.conn, account_id, bucket, self.rates, cache=cache)
+            return (
+                (dates, income) if income.any() else ((), ()),
+                (dates, expenses) if expenses.any() else ((), ()),
+            )
+        except ValueError:
+            # An unknown account or a missing exchange rate is reported, not drawn as an empty chart.
+            raise
+        except Exception as e:
+            print(f"Error getting time series data: {e}")
+            return ((), ()), ((), ())
 
-        # Update position when the main window is resized
-        self.root.bind("<Configure>", update_popup_position)
+    def show_notification(self, message: str, message_type: str) -> None:
+        """Display a pop-up notification in the bottom-right corner."""
+        self.notifications.notify(message, message_type)
 
     def run(self):
         self.root.mainloop()
+        self.tasks.shutdown()
+        if "Visualization" in self.built_pages:
+            from src.utils.Visualization import close_chart_surfaces
+
+            close_chart_surfaces()
 
 
 if __name__ == "__main__":
+    mark_startup("imports")
     root = ctk.CTk()
     app = BudgetTrackerApp(root)
-    app.run()
\ No newline at end of file
+    app.run()
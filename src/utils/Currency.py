@@ -0,0 +1,270 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from src.utils.Database import DEFAULT_CURRENCY
+from src.utils.Money import Money
+
+# Rates are quoted per unit of this currency.
+BASE_CURRENCY = DEFAULT_CURRENCY
+
+# Currencies offered when entering transactions and choosing a display currency.
+SUPPORTED_CURRENCIES = ("USD", "EUR", "GBP", "INR")
+
+# Rates older than this are refreshed in the background; older ones are still used until then.
+DEFAULT_RATE_TTL_SECONDS = 12 * 60 * 60
+
+# After a failed refresh (e.g. offline), wait this long before trying again.
+RETRY_AFTER_FAILURE_SECONDS = 60
+
+DEFAULT_RATES_URL = "https://api.exchangerate-api.com/v4/latest/{base}"
+HTTP_TIMEOUT_SECONDS = 5
+
+
+def round_cents(cents: float) -> Money:
+    """Money from a float amount of cents, rounding half up."""
+    return Money(math.floor(cents + 0.5))
+
+
+def _parse_rates(rates) -> dict:
+    """{currency: rate} from a provider payload's ``rates`` object.
+
+    Raises:
+        ValueError: If a rate is not a finite positive number.
+    """
+    parsed = {str(currency): float(rate) for currency, rate in rates.items()}
+    for currency, rate in parsed.items():
+        if not math.isfinite(rate) or rate <= 0:
+            raise ValueError(f"Invalid rate for {currency}: {rate!r}")
+    return parsed
+
+
+class RateProvider(ABC):
+    """Source of exchange rates. Subclasses implement ``fetch``."""
+
+    @abstractmethod
+    def fetch(self, base: str) -> dict:
+        """Return {currency: units of currency per one unit of ``base``}.
+
+        Raises:
+            RuntimeError: If the rates could not be obtained; nothing else, so callers can fall back.
+        """
+
+
+class HttpRateProvider(RateProvider):
+    """Rates from a JSON HTTP endpoint shaped like exchangerate-api.com's ``latest``."""
+
+    def __init__(self, url: str = DEFAULT_RATES_URL, timeout: float = HTTP_TIMEOUT_SECONDS) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self, base: str) -> dict:
+        import requests
+
+        try:
+            response = requests.get(self.url.format(base=base), timeout=self.timeout)
+            response.raise_for_status()
+            return _parse_rates(response.json()["rates"])
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Could not fetch exchange rates: {e}")
+
+
+class FileRateProvider(RateProvider):
+    """Rates from a local JSON fixture: {"base": "USD", "rates": {...}}."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def fetch(self, base: str) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as rates_file:
+                payload = json.load(rates_file)
+            if payload.get("base", base) != base:
+                raise RuntimeError(f"{self.path} holds {payload['base']} rates, not {base}.")
+            return _parse_rates(payload["rates"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Could not read exchange rates from {self.path}: {e}")
+
+
+class RateService:
+    """Exchange rates served from memory, persisted in ``exchange_rates`` and refreshed in the background.
+
+    Conversions never touch the network: they use the rates in memory, which
+    are loaded from the database at startup and replaced after each
+    successful refresh. When a refresh fails (e.g. offline) the last known
+    rates stay in use. Methods may be called from worker threads.
+
+    Each refresh also records the day's rates in ``exchange_rate_history``;
+    totals convert every transaction at the rate of its own date (the nearest
+    earlier recorded day, or the earliest one for older transactions).
+    """
+
+    def __init__(
+        self,
+        provider: RateProvider,
+        base: str = BASE_CURRENCY,
+        ttl_seconds: float = DEFAULT_RATE_TTL_SECONDS,
+    ) -> None:
+        self.provider = provider
+        self.base = base
+        self.ttl_seconds = ttl_seconds
+        self.last_error = None
+        self._rates = {}
+        self._history = {}
+        self._fetched_at = None
+        self._failed_at = None
+        self._lock = threading.Lock()
+
+    def load(self, conn: sqlite3.Connection) -> bool:
+        """Load the stored rates and rate history into memory; False if no rates are stored yet."""
+        self._load_history(conn)
+        rows = conn.execute(
+            "SELECT currency, rate, fetched_at FROM exchange_rates WHERE base = ?", (self.base,)
+        ).fetchall()
+        if not rows:
+            return False
+        with self._lock:
+            self._rates = {currency: rate for currency, rate, _ in rows}
+            self._rates[self.base] = 1.0
+            self._fetched_at = min(fetched_at for _, _, fetched_at in rows)
+        return True
+
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.time() - self._fetched_at > self.ttl_seconds
+
+    def refresh(self, conn: sqlite3.Connection) -> bool:
+        """Fetch every rate for the base currency once and store it. Blocking; run it off the Tk thread.
+
+        Returns:
+            bool: True if new rates were stored; False if the last known rates stay in use.
+        """
+        try:
+            rates = self.provider.fetch(self.base)
+        except RuntimeError as e:
+            self.last_error = str(e)
+            self._failed_at = time.time()
+            print(f"Exchange rate refresh failed: {e}")
+            return False
+
+        fetched_at = int(time.time())
+        with conn:
+            conn.execute("DELETE FROM exchange_rates WHERE base = ?", (self.base,))
+            conn.executemany(
+                "INSERT INTO exchange_rates (base, currency, rate, fetched_at) VALUES (?, ?, ?, ?)",
+                [(self.base, currency, rate, fetched_at) for currency, rate in rates.items()],
+            )
+        self.store_history(conn, date.today().isoformat(), rates)
+        with self._lock:
+            self._rates = dict(rates)
+            self._rates[self.base] = 1.0
+            self._fetched_at = fetched_at
+        self.last_error = None
+        return True
+
+    def store_history(self, conn: sqlite3.Connection, day: str, rates: dict) -> None:
+        """Record one day's rates (replacing any already stored for that day) and reload the history."""
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO exchange_rate_history (base, currency, date, rate) VALUES (?, ?, ?, ?)",
+                [(self.base, currency, day, rate) for currency, rate in rates.items()],
+            )
+        self._load_history(conn)
+
+    def _load_history(self, conn: sqlite3.Connection) -> None:
+        # Kept as plain lists: load() runs before the login window, which must not pay for importing NumPy.
+        # rates_on() turns a currency's history into arrays when a conversion first needs it.
+        rows = conn.execute(
+            "SELECT currency, CAST(julianday(date) - 2440587.5 AS INTEGER), rate FROM exchange_rate_history "
+            "WHERE base = ? ORDER BY currency, date",
+            (self.base,),
+        ).fetchall()
+        history = {}
+        for currency, day, rate in rows:
+            history.setdefault(currency, ([], []))
+            history[currency][0].append(day)
+            history[currency][1].append(rate)
+        with self._lock:
+            self._history = history
+
+    def refresh_in_background(self, runner) -> None:
+        """Refresh on a TaskRunner worker if the rates are missing or older than the TTL."""
+        recently_failed = self._failed_at is not None and time.time() - self._failed_at < RETRY_AFTER_FAILURE_SECONDS
+        if self.is_stale() and not recently_failed:
+            runner.submit(lambda task: self.refresh(task.db), key="exchange-rates")
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of ``to_currency`` per unit of ``from_currency``, crossing through the base.
+
+        Raises:
+            ValueError: If either currency has no known rate.
+        """
+        if from_currency == to_currency:
+            return 1.0
+        with self._lock:
+            rates = self._rates
+        try:
+            return rates[to_currency] / rates[from_currency]
+        except KeyError as e:
+            raise ValueError(f"No exchange rate available for {e.args[0]}.")
+
+    def convert(self, amount: Money, from_currency: str, to_currency: str) -> Money:
+        """Convert an amount, rounding half up to the cent."""
+        rate = Decimal(repr(self.rate(from_currency, to_currency)))
+        return Money.parse(amount.to_decimal() * rate) if rate != 1 else Money(amount.cents)
+
+    def rates_on(self, currency: str, days: "np.ndarray") -> "np.ndarray":
+        """Units of ``currency`` per unit of the base on each day (days since 1970-01-01).
+
+        Raises:
+            ValueError: If the currency has neither history nor a current rate.
+        """
+        import numpy as np
+
+        if currency == self.base:
+            return np.ones(len(days))
+        with self._lock:
+            history = self._history.get(currency)
+            current = self._rates.get(currency)
+            if history is not None and isinstance(history[0], list):
+                history = (np.array(history[0], dtype=np.int64), np.array(history[1], dtype=np.float64))
+                self._history[currency] = history
+        if history is not None:
+            history_days, history_rates = history
+            positions = np.searchsorted(history_days, days, side="right") - 1
+            return history_rates[np.maximum(positions, 0)]
+        if current is not None:
+            return np.full(len(days), current)
+        raise ValueError(f"No exchange rate available for {currency}.")
+
+    def convert_amounts(
+        self, currencies: "np.ndarray", days: "np.ndarray", cents: "np.ndarray", to_currency: str
+    ) -> "np.ndarray":
+        """Convert amounts in cents, each at the rate of its own day, to float cents of ``to_currency``.
+
+        Each currency is converted with one lookup of the rate on every day it
+        appears and one multiply.
+        """
+        import numpy as np
+
+        converted = np.asarray(cents, dtype=np.float64).copy()
+        for currency in np.unique(currencies):
+            if currency == to_currency:
+                continue
+            rows = currencies == currency
+            converted[rows] *= self.rates_on(to_currency, days[rows]) / self.rates_on(currency, days[rows])
+        return converted
+
+    @property
+    def fetched_at(self) -> Optional[float]:
+        return self._fetched_at
+
+
+def default_provider(rates_file: Optional[str] = None) -> RateProvider:
+    """The HTTP provider, or a fixture file provider when ``rates_file`` is given."""
+    return FileRateProvider(rates_file) if rates_file else HttpRateProvider()
@@ -1,9 +1,54 @@
+import os
 import sqlite3
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, timedelta
+from typing import Callable, Optional
 import bcrypt
 
+from src.utils.Money import MAX_CENTS, MIN_CENTS, Money
+
+TRANSACTION_TYPES = ("income", "expense")
+TRANSACTION_COLUMNS = ("id", "account_id", "type", "category", "amount", "currency", "date")
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_QUERY_CACHE_BYTES = 8 * 1024 * 1024
+TIME_BUCKETS = ("day", "week", "month", "year")
+
+# Currency of transactions stored without one, including every row written before currencies existed.
+DEFAULT_CURRENCY = "USD"
+
+# bcrypt work factor for new hashes. Stored hashes with a different cost are
+# re-hashed transparently on the user's next successful login.
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+def _bcrypt_rounds_from_env() -> int:
+    """BUDGET_TRACKER_BCRYPT_ROUNDS if it is a cost bcrypt accepts (4 to 31), else DEFAULT_BCRYPT_ROUNDS."""
+    value = os.environ.get("BUDGET_TRACKER_BCRYPT_ROUNDS")
+    if value is None:
+        return DEFAULT_BCRYPT_ROUNDS
+    try:
+        rounds = int(value)
+    except ValueError:
+        rounds = None
+    if rounds is None or not 4 <= rounds <= 31:
+        print(f"Ignoring BUDGET_TRACKER_BCRYPT_ROUNDS={value!r}; expected 4 to 31. Using {DEFAULT_BCRYPT_ROUNDS}.")
+        return DEFAULT_BCRYPT_ROUNDS
+    return rounds
+
+
+BCRYPT_ROUNDS = _bcrypt_rounds_from_env()
+
+# Stay well under SQLite's default limit on bound parameters per statement.
+_MAX_IN_PARAMS = 500
+
 
 def create_tables(conn) -> None:
-    """Create necessary tables."""
+    """Create necessary tables.
+
+    This is the original schema; later changes are applied by run_migrations.
+    """
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -31,53 +76,64 @@ def create_tables(conn) -> None:
     conn.commit()
 
 
-def create_user_account(self, conn: sqlite3.Connection, username: str, password: str) -> None:
-        """Create a new user account."""
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-        
-        try:
-            with conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO accounts (username, password) VALUES (?, ?)",
-                    (username, hashed_password),
-                )
-            print("User account created successfully.")
-        except sqlite3.IntegrityError:
-            raise ValueError("Username already exists. Please choose a different username.")
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Database error: {e}")
+def hash_password(password: str, rounds: int = None) -> bytes:
+    """Hash a password with bcrypt. Slow by design; call it off the UI thread."""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds or BCRYPT_ROUNDS))
 
 
+def verify_password(password: str, hashed_password: bytes) -> bool:
+    """Check a password against a bcrypt hash. Slow by design; call it off the UI thread."""
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
+
+
+def password_needs_rehash(hashed_password: bytes, rounds: int = None) -> bool:
+    """Return True if the hash was made with a different work factor than configured."""
+    try:
+        cost = int(hashed_password.split(b"$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != (rounds or BCRYPT_ROUNDS)
+
 
-def validate_user(conn: sqlite3.Connection, username: str, password: str) -> bool:
-    """Validate user credentials against the stored hashed password."""
+def fetch_password_hash(conn: sqlite3.Connection, username: str):
+    """Return the stored bcrypt hash for a username, or None if there is no such user."""
     if conn is None:
         raise ValueError("Database connection is not valid.")
+    cursor = conn.cursor()
+    cursor.execute("SELECT password FROM accounts WHERE username = ?", (username,))
+    result = cursor.fetchone()
+    cursor.close()
+    if result is None:
+        return None
+    hashed_password = result[0]
+    return hashed_password.encode("utf-8") if isinstance(hashed_password, str) else hashed_password
 
-    try:
-        # Create a cursor without a context manager
-        cursor = conn.cursor()
-        
-        # Execute the query to fetch the hashed password for the given username
-        cursor.execute("SELECT password FROM accounts WHERE username = ?", (username,))
-        result = cursor.fetchone()
-        
-        # Close the cursor explicitly
-        cursor.close()
-        
-        # Check if user exists and if the password matches the hashed password
-        if result and bcrypt.checkpw(password.encode("utf-8"), result[0]):
-            return True
-        else:
-            return False
 
+def store_user_account(conn: sqlite3.Connection, username: str, hashed_password: bytes) -> None:
+    """Insert a new account with an already computed password hash."""
+    try:
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO accounts (username, password) VALUES (?, ?)",
+                (username, hashed_password),
+            )
+        print("User account created successfully.")
+    except sqlite3.IntegrityError:
+        raise ValueError("Username already exists. Please choose a different username.")
     except sqlite3.Error as e:
-        # Handle database errors (logging can be added here)
-        print(f"Database error occurred: {e}")
+        raise RuntimeError(f"Database error: {e}")
 
-    return False
 
+def update_password_hash(conn: sqlite3.Connection, username: str, hashed_password: bytes) -> None:
+    """Replace a user's stored hash, e.g. after the work factor changed."""
+    try:
+        with conn:
+            conn.execute(
+                "UPDATE accounts SET password = ? WHERE username = ?", (hashed_password, username)
+            )
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Database error: {e}")
 
 
 def get_account_id(conn, username: str) -> int:
@@ -90,41 +146,1037 @@ def get_account_id(conn, username: str) -> int:
     raise ValueError("Account not found.")
 
 
-def fetch_data(conn, account_id: int) -> list:                  #Added Error Handling
-    """Fetch transactions for a given account ID."""
+def fetch_data(
+    conn: sqlite3.Connection,
+    account_id: int,
+    columns: tuple = TRANSACTION_COLUMNS,
+    transaction_type: str = None,
+    start_date: str = None,
+    end_date: str = None,
+    after: tuple = None,
+    limit: int = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """Stream transactions for an account in (date, id) order.
+
+    Rows are pulled from SQLite ``batch_size`` at a time, so memory use does
+    not grow with the size of the account.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account to read.
+        columns (tuple): Columns to project, from TRANSACTION_COLUMNS.
+        transaction_type (str): Only "income" or "expense" rows, if given.
+        start_date (str): Inclusive lower bound, YYYY-MM-DD.
+        end_date (str): Inclusive upper bound, YYYY-MM-DD.
+        after (tuple): Keyset cursor; only rows after this (date, id) are returned.
+        limit (int): Maximum number of rows to return.
+        batch_size (int): Rows fetched per fetchmany call.
+
+    Yields:
+        tuple: One row per transaction with the requested columns.
+    """
     if conn is None:
         raise ValueError("Database connection is not valid")
-    try:   
-        with conn:     
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transactions WHERE account_id = ?", (account_id,))
-            return cursor.fetchall()
+    unknown = set(columns) - set(TRANSACTION_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown transaction columns: {', '.join(sorted(unknown))}")
+
+    conditions = ["account_id = ?"]
+    params = [account_id]
+    if transaction_type is not None:
+        conditions.append("type = ?")
+        params.append(transaction_type)
+    if start_date is not None:
+        conditions.append("date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("date <= ?")
+        params.append(end_date)
+    if after is not None:
+        conditions.append("(date, id) > (?, ?)")
+        params.extend(after)
+    query = (
+        f"SELECT {', '.join(columns)} FROM transactions "
+        f"WHERE {' AND '.join(conditions)} ORDER BY date, id"
+    )
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
     except sqlite3.Error as e:
-        print(f"Database error occurred while fetching data: {e}")
-        return []
+        # Raise rather than stop early: a consumer must not mistake a failed read for the end of the data.
+        raise RuntimeError(f"Database error occurred while fetching data: {e}")
+    finally:
+        cursor.close()
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    account_id: int,
+    after: tuple = None,
+    page_size: int = 50,
+    columns: tuple = TRANSACTION_COLUMNS,
+    **filters,
+) -> tuple:
+    """Fetch one keyset page of transactions.
+
+    Returns:
+        tuple: (rows, cursor) where cursor is the (date, id) to pass as
+        ``after`` for the next page, or None on the last page.
+    """
+    rows = list(
+        fetch_data(conn, account_id, tuple(columns) + ("date", "id"), after=after, limit=page_size, **filters)
+    )
+    next_after = (rows[-1][-2], rows[-1][-1]) if len(rows) == page_size else None
+    return [row[:-2] for row in rows], next_after
+
+
+def _lookup_accounts(conn: sqlite3.Connection, column: str, keys: set) -> dict:
+    """Map usernames or IDs (``column``) to account IDs with one IN query per chunk."""
+    account_ids = {}
+    keys = list(keys)
+    cursor = conn.cursor()
+    for start in range(0, len(keys), _MAX_IN_PARAMS):
+        chunk = keys[start:start + _MAX_IN_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(f"SELECT {column}, id FROM accounts WHERE {column} IN ({placeholders})", chunk)
+        account_ids.update(cursor.fetchall())
+    return account_ids
+
+
+def _parse_iso_date(value) -> date:
+    """Parse a YYYY-MM-DD date, rejecting other ISO 8601 forms fromisoformat accepts.
+
+    Dates are stored and compared as text, so only the canonical form sorts
+    and slices (``substr(date, 1, 7)``) correctly.
+    """
+    try:
+        parsed = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None or parsed.isoformat() != value:
+        raise ValueError(f"Invalid date (expected YYYY-MM-DD): {value!r}")
+    return parsed
+
+
+def insert_transactions(conn: sqlite3.Connection, rows) -> tuple:
+    """Validate a batch of transactions and insert the valid ones in one commit.
 
+    Each row is a mapping with ``account`` (username) or ``account_id``,
+    ``type`` ("income" or "expense"), ``category``, ``amount`` (Money or
+    anything Money.parse accepts), ``date`` (YYYY-MM-DD) and an optional
+    three-letter ``currency`` code (DEFAULT_CURRENCY if omitted).
 
-def fetch_total(conn: sqlite3.Connection, account_id: int) -> float:     #Added Error Handling
-    """Fetch total balance for a given account ID."""
+    Returns:
+        tuple: (number of rows inserted, list of (row index, error message)).
+    """
+    if conn is None:
+        raise ValueError("Database connection is not valid.")
+
+    rows = list(rows)
+    mappings = [row for row in rows if isinstance(row, Mapping)]
+    usernames = {
+        row["account"] for row in mappings if row.get("account_id") is None and isinstance(row.get("account"), str)
+    }
+    by_name = _lookup_accounts(conn, "username", usernames)
+    account_ids = {row["account_id"] for row in mappings if isinstance(row.get("account_id"), int)}
+    by_id = _lookup_accounts(conn, "id", account_ids)
+
+    values = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            # Anything malformed must end up in errors rather than abort the rest of the batch.
+            if not isinstance(row, Mapping):
+                raise ValueError(f"Invalid row: expected a mapping, got {type(row).__name__}.")
+            if row.get("account_id") is not None:
+                account_id = by_id.get(row["account_id"]) if isinstance(row["account_id"], int) else None
+            elif row.get("account"):
+                account_id = by_name.get(row["account"]) if isinstance(row["account"], str) else None
+            else:
+                raise ValueError("Account name is required.")
+            if account_id is None:
+                raise ValueError("Account does not exist.")
+            if row.get("type") not in TRANSACTION_TYPES:
+                raise ValueError(f"Invalid transaction type: {row.get('type')!r}")
+            if not row.get("category") or not isinstance(row["category"], str):
+                raise ValueError("Category is required.")
+            amount = row.get("amount")
+            if amount is None or amount == "":
+                raise ValueError("Amount is required.")
+            if not isinstance(amount, Money):
+                amount = Money.parse(amount)
+            if not MIN_CENTS <= amount.cents <= MAX_CENTS:
+                raise ValueError(f"Amount out of range: {row.get('amount')!r}")
+            day = row.get("date")
+            _parse_iso_date(day)
+            currency = row.get("currency") or DEFAULT_CURRENCY
+            if isinstance(currency, str):
+                currency = currency.strip().upper()
+            if not isinstance(currency, str) or len(currency) != 3 or not currency.isalpha():
+                raise ValueError(f"Invalid currency code: {row.get('currency')!r}")
+            values.append(
+                (account_id, row["type"], row["category"], amount.cents, currency, day)
+            )
+        except ValueError as e:
+            errors.append((index, str(e)))
+
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO transactions (account_id, type, category, amount, currency, date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                values,
+            )
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Database error: {e}")
+
+    return len(values), errors
+
+
+def fetch_total(conn: sqlite3.Connection, account_id: int) -> int:     #Added Error Handling
+    """Fetch total balance in cents for a given account ID."""
     if conn is None:
         raise ValueError("Database connection is not valid.")
     
     try:
         with conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT SUM(amount) FROM transactions WHERE account_id = ?", (account_id,))
+            cursor.execute("SELECT SUM(total) FROM transaction_rollups WHERE account_id = ?", (account_id,))
             result = cursor.fetchone()
             if result and result[0] is not None:
                 return result[0]
-            return 0.0  
+            return 0
     except sqlite3.Error as e:
         print(f"Database error occurred while fetching total: {e}")
-        return 0.0 
+        return 0
+
+
+
+def _estimate_size(rows: list) -> int:
+    """Approximate memory held by a list of result tuples."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class QueryCache:
+    """LRU cache of read-query results for one connection, bounded in bytes.
+
+    Results are keyed by whitespace-normalized SQL and parameters. Before
+    each lookup the cache compares ``PRAGMA data_version`` (which changes when
+    another connection or process commits) and the connection's own
+    ``total_changes`` with the values it last saw, and drops every entry if
+    either moved. Like the connection, an instance belongs to one thread.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, max_bytes: int = DEFAULT_QUERY_CACHE_BYTES) -> None:
+        self.conn = conn
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._token = None
+
+    def data_token(self) -> tuple:
+        """A cheap value that changes whenever the database content may have changed."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return version, self.conn.total_changes
+
+    def fetchall(self, sql: str, params: tuple = ()) -> list:
+        """Return all rows for a read query, from the cache when still valid.
+
+        The returned list is shared with the cache; do not modify it.
+        """
+        token = self.data_token()
+        if token != self._token:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self._token = token
+
+        key = (" ".join(sql.split()), tuple(params))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        rows = self.conn.execute(sql, params).fetchall()
+        size = _estimate_size(rows)
+        if size <= self.max_bytes:
+            self._entries[key] = (rows, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+        return rows
+
+    def fetchone(self, sql: str, params: tuple = ()):
+        rows = self.fetchall(sql, params)
+        return rows[0] if rows else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+def fetch_category_totals(
+    conn: sqlite3.Connection,
+    account_id: int,
+    transaction_type: str,
+    month: Optional[str] = None,
+    cache: Optional[QueryCache] = None,
+) -> tuple:
+    """Fetch per-category totals in cents for one transaction type, from the rollups.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account ID.
+        transaction_type (str): "income" or "expense".
+        month (Optional[str]): Only this YYYY-MM month, if given.
+        cache (Optional[QueryCache]): Cache to read through instead of ``conn``.
+
+    Returns:
+        tuple: (totals, categories) as lists in category order.
+    """
+    sql = "SELECT category, SUM(total) FROM transaction_rollups WHERE account_id = ? AND type = ?"
+    params = (account_id, transaction_type)
+    if month is not None:
+        sql += " AND month = ?"
+        params += (month,)
+    sql += " GROUP BY category"
+    rows = cache.fetchall(sql, params) if cache is not None else conn.execute(sql, params).fetchall()
+    return [row[1] for row in rows], [row[0] for row in rows]
+
+
+# SQL giving the first day of the bucket holding ``date``; weeks start on Monday.
+_BUCKET_SQL = {
+    "day": "date",
+    "week": "date(date, '-6 days', 'weekday 1')",
+    "month": "substr(date, 1, 7) || '-01'",
+    "year": "substr(date, 1, 4) || '-01-01'",
+}
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+_ROLLUP_BUCKET_SQL = {
+    "month": "month || '-01'",
+    "year": "substr(month, 1, 4) || '-01-01'",
+}
+
+
+def _bucket_starts(days: "np.ndarray", bucket: str) -> "np.ndarray":
+    """Map datetime64[D] values to the first day of their bucket."""
+    import numpy as np
+
+    if bucket == "week":
+        # 1970-01-01 was a Thursday, three days after a Monday.
+        ordinal = days.astype(np.int64)
+        return (ordinal - (ordinal + 3) % 7).astype("datetime64[D]")
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    if bucket == "year":
+        return days.astype("datetime64[Y]").astype("datetime64[D]")
+    return days
+
+
+def _bucket_range(first: "np.datetime64", last: "np.datetime64", bucket: str) -> "np.ndarray":
+    """Every bucket start from ``first`` to ``last`` inclusive, both already bucket starts."""
+    import numpy as np
+
+    if bucket == "week":
+        return np.arange(first, last + 1, 7, dtype="datetime64[D]")
+    if bucket in ("month", "year"):
+        unit = "datetime64[M]" if bucket == "month" else "datetime64[Y]"
+        return np.arange(first.astype(unit), last.astype(unit) + 1).astype("datetime64[D]")
+    return np.arange(first, last + 1, dtype="datetime64[D]")
+
+
+def _covers_whole_months(start_date: Optional[str], end_date: Optional[str]) -> bool:
+    """Whether a date range can be answered from the monthly rollups."""
+    if start_date is not None and not start_date.endswith("-01"):
+        return False
+    return end_date is None or (date.fromisoformat(end_date) + timedelta(days=1)).day == 1
+
+
+def fetch_time_series(
+    conn: sqlite3.Connection,
+    account_id: int,
+    bucket: str = "day",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    cache: Optional[QueryCache] = None,
+) -> tuple:
+    """Fetch income and expense totals per time bucket, aggregated in SQLite.
+
+    Both series come from one query and share one gap-filled date axis, so
+    buckets with no transactions are present with a total of zero. Month and
+    year buckets are read from the rollup table when the range covers whole
+    months.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account ID.
+        bucket (str): One of TIME_BUCKETS.
+        start_date (Optional[str]): First ISO date to include.
+        end_date (Optional[str]): Last ISO date to include.
+        cache (Optional[QueryCache]): Cache to read through instead of ``conn``.
+
+    Returns:
+        tuple: (bucket start dates as datetime64[D], income cents, expense cents) as NumPy arrays.
+    """
+    # Imported here so opening the database (and the login window) does not pay for NumPy.
+    import numpy as np
+
+    if bucket not in _BUCKET_SQL:
+        raise ValueError(f"Unknown time bucket: {bucket!r}")
+    for value in (start_date, end_date):
+        if value is not None:
+            _parse_iso_date(value)
+
+    if bucket in ("month", "year") and _covers_whole_months(start_date, end_date):
+        table, column, key = "transaction_rollups", "total", "month"
+        bucket_sql = _ROLLUP_BUCKET_SQL[bucket]
+        bounds = [value[:7] if value else None for value in (start_date, end_date)]
+    else:
+        table, column, key = "transactions", "amount", "date"
+        bucket_sql = _BUCKET_SQL[bucket]
+        bounds = [start_date, end_date]
+
+    where = ["account_id = ?", "type IN ('income', 'expense')", f"{key} > ''"]
+    lower, upper = f"{key} >= ?", f"{key} <= ?"
+    params = [account_id]
+    for condition, value in zip((lower, upper), bounds):
+        if value is not None:
+            where.append(condition)
+            params.append(value)
+
+    # Bucket starts come back as days since 1970-01-01, which is what datetime64[D] holds,
+    # so the whole result converts to arrays without parsing a date string per row.
+    sql = (
+        f"SELECT CAST(julianday(bucket) - {_UNIX_EPOCH_JULIAN_DAY} AS INTEGER), income, expense FROM ("
+        f"SELECT {bucket_sql} AS bucket, "
+        f"SUM(CASE WHEN type = 'income' THEN {column} ELSE 0 END) AS income, "
+        f"SUM(CASE WHEN type = 'expense' THEN {column} ELSE 0 END) AS expense "
+        f"FROM {table} WHERE {' AND '.join(where)} "
+        "GROUP BY bucket) ORDER BY 1"
+    )
+    rows = cache.fetchall(sql, tuple(params)) if cache is not None else conn.execute(sql, params).fetchall()
+    table_rows = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return fill_time_buckets(
+        table_rows[:, 0].astype("datetime64[D]"), table_rows[:, 1], table_rows[:, 2], bucket, start_date, end_date
+    )
+
+
+def fill_time_buckets(
+    days: "np.ndarray",
+    income: "np.ndarray",
+    expense: "np.ndarray",
+    bucket: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> tuple:
+    """Sum dated amounts into one gap-filled run of buckets, as fetch_time_series returns them.
+
+    Args:
+        days (np.ndarray): Date of each amount as datetime64[D], ascending; any day within its bucket.
+        income (np.ndarray): Income amount on each day.
+        expense (np.ndarray): Expense amount on each day.
+        bucket (str): One of TIME_BUCKETS.
+        start_date (Optional[str]): First ISO date of the axis; the earliest day if omitted.
+        end_date (Optional[str]): Last ISO date of the axis; the latest day if omitted.
+
+    Returns:
+        tuple: (bucket start dates as datetime64[D], income, expense), the sums keeping the amounts' dtype.
+    """
+    import numpy as np
+
+    income, expense = np.asarray(income), np.asarray(expense)
+    if not len(days) and start_date is None:
+        return np.array([], dtype="datetime64[D]"), income[:0].copy(), expense[:0].copy()
+
+    first = np.datetime64(start_date, "D") if start_date else days[0]
+    last = np.datetime64(end_date, "D") if end_date else (days[-1] if len(days) else first)
+    starts = _bucket_range(*_bucket_starts(np.array([first, last]), bucket), bucket)
+
+    income_sums = np.zeros(len(starts), dtype=income.dtype)
+    expense_sums = np.zeros(len(starts), dtype=expense.dtype)
+    positions = np.searchsorted(starts, _bucket_starts(days, bucket))
+    np.add.at(income_sums, positions, income)
+    np.add.at(expense_sums, positions, expense)
+    return starts, income_sums, expense_sums
+
+
+_NEXT_CURRENCY_SQL = (
+    "SELECT currency FROM transactions WHERE account_id = ? AND type = ? AND currency > ? "
+    "ORDER BY currency LIMIT 1"
+)
+
+
+def fetch_account_currencies(conn: sqlite3.Connection, account_id: int, cache: Optional[QueryCache] = None) -> set:
+    """Return the currencies an account's transactions are in.
+
+    Each distinct currency costs one index seek (a loose index scan), so this
+    stays cheap however many rows the account holds.
+    """
+    currencies = set()
+    for transaction_type in TRANSACTION_TYPES:
+        previous = ""
+        while True:
+            params = (account_id, transaction_type, previous)
+            if cache is not None:
+                row = cache.fetchone(_NEXT_CURRENCY_SQL, params)
+            else:
+                row = conn.execute(_NEXT_CURRENCY_SQL, params).fetchone()
+            if row is None:
+                break
+            previous = row[0]
+            currencies.add(previous)
+    return currencies
+
+
+def fetch_category_sums(
+    conn: sqlite3.Connection,
+    account_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    by_currency: bool = False,
+    cache: Optional[QueryCache] = None,
+) -> list:
+    """Fetch an account's amounts summed per (type, category) in one grouped query.
+
+    Without ``by_currency`` the sums are read from the rollups when the range
+    covers whole months, so they cost the same for any account size. With
+    it, they are split further by currency and day (as days since
+    1970-01-01) so each group can be converted at its own date's rate.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account ID.
+        start_date (Optional[str]): First ISO date to include.
+        end_date (Optional[str]): Last ISO date to include.
+        by_currency (bool): Also group by currency and day.
+        cache (Optional[QueryCache]): Cache to read through instead of ``conn``.
+
+    Returns:
+        list: (type, category, cents) rows, or (type, category, currency, day, cents) rows with ``by_currency``.
+    """
+    for value in (start_date, end_date):
+        if value is not None:
+            _parse_iso_date(value)
+
+    select = group_by = "type, category"
+    if not by_currency and _covers_whole_months(start_date, end_date):
+        table, column, key = "transaction_rollups", "total", "month"
+        bounds = [value[:7] if value else None for value in (start_date, end_date)]
+    else:
+        table, column, key = "transactions", "amount", "date"
+        bounds = [start_date, end_date]
+        if by_currency:
+            day = f"CAST(julianday(date) - {_UNIX_EPOCH_JULIAN_DAY} AS INTEGER)"
+            select, group_by = f"type, category, currency, {day}", "type, category, currency, date"
+
+    where = ["account_id = ?", "type IN ('income', 'expense')"]
+    params = [account_id]
+    for condition, value in zip((f"{key} >= ?", f"{key} <= ?"), bounds):
+        if value is not None:
+            where.append(condition)
+            params.append(value)
+    sql = f"SELECT {select}, SUM({column}) FROM {table} WHERE {' AND '.join(where)} GROUP BY {group_by}"
+    return cache.fetchall(sql, tuple(params)) if cache is not None else conn.execute(sql, params).fetchall()
+
+
+def get_change_seq(conn: sqlite3.Connection, account_id: int) -> int:
+    """How many times the account's transactions have been edited or deleted."""
+    row = conn.execute("SELECT seq FROM transaction_changes WHERE account_id = ?", (account_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def fetch_export_watermark(conn: sqlite3.Connection, account_id: int, target: str) -> Optional[tuple]:
+    """Return (type, (last date, last id), max id, change seq, file size) recorded for an export file, or None."""
+    row = conn.execute(
+        "SELECT type, last_date, last_id, max_id, change_seq, file_size FROM export_watermarks "
+        "WHERE account_id = ? AND target = ?",
+        (account_id, target),
+    ).fetchone()
+    return (row[0], (row[1], row[2]), row[3], row[4], row[5]) if row else None
+
+
+def store_export_watermark(
+    conn: sqlite3.Connection,
+    account_id: int,
+    target: str,
+    transaction_type: str,
+    last_key: tuple,
+    max_id: int,
+    change_seq: int,
+    file_size: int,
+) -> None:
+    """Record an export file's watermark and the change sequence and file size it was written at."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO export_watermarks "
+            "(account_id, target, type, last_date, last_id, max_id, change_seq, file_size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (account_id, target, transaction_type, *last_key, max_id, change_seq, file_size),
+        )
+
+
+# Walks only the rows inserted after ``id``; the unary plus keeps SQLite off the per-account indexes,
+# which would visit every older row instead.
+_BACKDATED_SQL = (
+    "SELECT 1 FROM transactions WHERE id > ? AND +account_id = ? AND +type = ? AND +date < ? LIMIT 1"
+)
+
+
+def has_backdated_rows(
+    conn: sqlite3.Connection, account_id: int, transaction_type: str, max_id: int, last_date: str
+) -> bool:
+    """Whether any row with an id above ``max_id`` is dated before ``last_date``.
 
+    Such a row sorts among rows already exported, so it cannot be appended.
+    """
+    params = (max_id, account_id, transaction_type, last_date)
+    return conn.execute(_BACKDATED_SQL, params).fetchone() is not None
+
+
+def _migration_add_transaction_indexes(cursor) -> None:
+    """Covering indexes for the per-account totals, category and date queries."""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_account_type_date "
+        "ON transactions (account_id, type, date, amount)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_account_type_category "
+        "ON transactions (account_id, type, category, amount)"
+    )
+
+
+def _migration_iso_dates(cursor) -> None:
+    """Rewrite legacy dd/mm/YYYY dates as sortable ISO-8601 YYYY-MM-DD."""
+    cursor.execute(
+        """
+        UPDATE transactions
+        SET date = substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)
+        WHERE date GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]'
+        """
+    )
+
+
+def _migration_integer_cents(cursor) -> None:
+    """Rebuild transactions with amount stored as integer cents instead of REAL."""
+    cursor.execute(
+        """
+        CREATE TABLE transactions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            account_id INTEGER,
+            type TEXT,
+            category TEXT,
+            amount INTEGER NOT NULL,
+            currency TEXT,
+            date TEXT,
+            FOREIGN KEY (account_id) REFERENCES accounts (id)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO transactions_new (id, account_id, type, category, amount, currency, date)
+        SELECT id, account_id, type, category, CAST(ROUND(amount * 100) AS INTEGER), currency, date
+        FROM transactions
+        """
+    )
+    cursor.execute("DROP TABLE transactions")
+    cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+    _migration_add_transaction_indexes(cursor)
+
+
+_ROLLUP_KEY_OLD = (
+    "account_id = OLD.account_id AND type = OLD.type "
+    "AND category = IFNULL(OLD.category, '') AND month = IFNULL(substr(OLD.date, 1, 7), '')"
+)
+
+
+def _migration_add_rollups(cursor) -> None:
+    """Per-account, per-type, per-category, per-month totals kept current by triggers."""
+    cursor.execute(
+        """
+        CREATE TABLE transaction_rollups (
+            account_id INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            month TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (account_id, type, category, month)
+        ) WITHOUT ROWID
+        """
+    )
+    add_new_row = """
+        INSERT INTO transaction_rollups (account_id, type, category, month, total, count)
+        SELECT NEW.account_id, NEW.type, IFNULL(NEW.category, ''), IFNULL(substr(NEW.date, 1, 7), ''), NEW.amount, 1
+        WHERE NEW.account_id IS NOT NULL AND NEW.type IS NOT NULL
+        ON CONFLICT (account_id, type, category, month)
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    """
+    remove_old_row = f"""
+        UPDATE transaction_rollups SET total = total - OLD.amount, count = count - 1
+        WHERE {_ROLLUP_KEY_OLD};
+        DELETE FROM transaction_rollups WHERE {_ROLLUP_KEY_OLD} AND count = 0;
+    """
+    cursor.execute(
+        f"CREATE TRIGGER transactions_rollup_insert AFTER INSERT ON transactions BEGIN {add_new_row} END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER transactions_rollup_delete AFTER DELETE ON transactions BEGIN {remove_old_row} END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER transactions_rollup_update "
+        "AFTER UPDATE OF account_id, type, category, amount, date ON transactions "
+        f"BEGIN {remove_old_row} {add_new_row} END"
+    )
+    cursor.execute(_ROLLUP_REBUILD_SQL)
+
+
+def _migration_add_keyset_index(cursor) -> None:
+    """Index serving (date, id) ordered reads and keyset pagination per account."""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions (account_id, date)"
+    )
+
+
+def _migration_add_exchange_rates(cursor) -> None:
+    """Latest known exchange rates per base currency, kept for offline use."""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS exchange_rates (
+            base TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            rate REAL NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            PRIMARY KEY (base, currency)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _migration_add_currency_history(cursor) -> None:
+    """Give every transaction a currency and keep one exchange rate per currency per day."""
+    cursor.execute("UPDATE transactions SET currency = ? WHERE currency IS NULL", (DEFAULT_CURRENCY,))
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS exchange_rate_history (
+            base TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            date TEXT NOT NULL,
+            rate REAL NOT NULL,
+            PRIMARY KEY (base, currency, date)
+        ) WITHOUT ROWID
+        """
+    )
+    # Serves the per-(type, currency, date) sums behind converted totals without touching the table.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_account_type_currency "
+        "ON transactions (account_id, type, currency, date, amount)"
+    )
+
+
+def _migration_add_category_currency_index(cursor) -> None:
+    """Covering index for per-category sums split by currency and day."""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_account_type_category_currency "
+        "ON transactions (account_id, type, category, currency, date, amount)"
+    )
+
+
+def _migration_add_export_watermarks(cursor) -> None:
+    """Per-account change sequence bumped by edits and deletes, and per-file export watermarks."""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transaction_changes (
+            account_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+        """
+    )
+    bump = """
+        INSERT INTO transaction_changes (account_id, seq)
+        SELECT {account}, 1 WHERE {condition}
+        ON CONFLICT (account_id) DO UPDATE SET seq = seq + 1;
+    """
+    bump_old = bump.format(account="OLD.account_id", condition="OLD.account_id IS NOT NULL")
+    bump_new = bump.format(
+        account="NEW.account_id", condition="NEW.account_id IS NOT NULL AND NEW.account_id IS NOT OLD.account_id"
+    )
+    # Inserts are not changes: incremental exports pick new rows up by keyset.
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS transactions_changes_delete AFTER DELETE ON transactions BEGIN {bump_old} END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_changes_update "
+        "AFTER UPDATE OF account_id, type, category, amount, currency, date ON transactions "
+        f"BEGIN {bump_old} {bump_new} END"
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            account_id INTEGER NOT NULL,
+            target TEXT NOT NULL,
+            type TEXT NOT NULL,
+            last_date TEXT NOT NULL,
+            last_id INTEGER NOT NULL,
+            max_id INTEGER NOT NULL,
+            change_seq INTEGER NOT NULL,
+            file_size INTEGER NOT NULL,
+            PRIMARY KEY (account_id, target)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _migration_drop_redundant_category_index(cursor) -> None:
+    """Drop the (account_id, type, category, amount) index; migration 8's index has the same prefix and covers it."""
+    cursor.execute("DROP INDEX IF EXISTS idx_transactions_account_type_category")
+
+
+# Ordered schema migrations as (version, description, function). Append new
+# entries at the end; never renumber or edit one that has already shipped.
+MIGRATIONS = [
+    (1, "Add covering indexes on transactions", _migration_add_transaction_indexes),
+    (2, "Store transaction dates as ISO-8601", _migration_iso_dates),
+    (3, "Store transaction amounts as integer cents", _migration_integer_cents),
+    (4, "Add trigger-maintained transaction rollups", _migration_add_rollups),
+    (5, "Add (account_id, date) index for keyset pagination", _migration_add_keyset_index),
+    (6, "Add exchange_rates table", _migration_add_exchange_rates),
+    (7, "Add transaction currencies and daily exchange rate history", _migration_add_currency_history),
+    (8, "Add (account_id, type, category, currency, date) index for summaries", _migration_add_category_currency_index),
+    (9, "Add transaction change sequence and export watermarks", _migration_add_export_watermarks),
+    (10, "Drop index made redundant by the summary index", _migration_drop_redundant_category_index),
+]
+
+# Computes every rollup row from the raw transactions table.
+_ROLLUP_SELECT_SQL = """
+    SELECT account_id, type, IFNULL(category, ''), IFNULL(substr(date, 1, 7), ''), SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE account_id IS NOT NULL AND type IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+"""
+_ROLLUP_REBUILD_SQL = (
+    "INSERT INTO transaction_rollups (account_id, type, category, month, total, count)"
+    + _ROLLUP_SELECT_SQL
+)
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied migration version (0 for a fresh database)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    result = cursor.fetchone()
+    return result[0] or 0
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations in order and return the resulting schema version."""
+    current = get_schema_version(conn)
+    conn.commit()
+
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migration(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) "
+                "VALUES (?, ?, datetime('now'))",
+                (version, description),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise RuntimeError(f"Migration {version} ({description}) failed: {e}")
+        current = version
+
+    return current
+
+
+def capture_queries(conn: sqlite3.Connection, run: Callable[[], object]) -> list:
+    """Call ``run()`` and return the distinct SELECT statements it executed on ``conn``, in order.
+
+    Statements come back with their parameters inlined, as SQLite traces them.
+    """
+    queries = []
+
+    def trace(statement: str) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and statement not in queries:
+            queries.append(statement)
+
+    conn.set_trace_callback(trace)
+    try:
+        run()
+    finally:
+        conn.set_trace_callback(None)
+    return queries
+
+
+def _run_hot_reads(conn: sqlite3.Connection) -> None:
+    """Issue every read behind the pages, charts, summaries and exports once."""
+    account_id = 1
+    fetch_total(conn, account_id)
+    for month in (None, "2024-01"):
+        fetch_category_totals(conn, account_id, "expense", month)
+    # Whole months read month and year buckets from the rollups; partial ones read the raw rows.
+    for start_date, end_date in ((None, None), ("2024-01-01", "2024-12-31"), ("2024-01-15", "2024-02-10")):
+        for bucket in TIME_BUCKETS:
+            fetch_time_series(conn, account_id, bucket, start_date, end_date)
+        fetch_category_sums(conn, account_id, start_date, end_date)
+    fetch_category_sums(conn, account_id, by_currency=True)
+    fetch_account_currencies(conn, account_id)
+    fetch_page(conn, account_id)
+    fetch_page(conn, account_id, after=("2024-01-01", 1), transaction_type="expense")
+    list(fetch_data(conn, account_id, transaction_type="income", start_date="2024-01-01", end_date="2024-12-31"))
+    get_change_seq(conn, account_id)
+    fetch_export_watermark(conn, account_id, "export.csv")
+    has_backdated_rows(conn, account_id, "income", 0, "2024-01-01")
+
+
+def hot_queries(conn: sqlite3.Connection) -> list:
+    """The SQL the app runs on page views and exports, captured from the functions that build it."""
+    return capture_queries(conn, lambda: _run_hot_reads(conn))
+
+
+def find_full_scans(conn: sqlite3.Connection, queries: Optional[list] = None) -> list:
+    """Return (query, plan detail) pairs for queries that scan instead of search.
+
+    A ``SCAN`` step reads every row of a table or index, so a hot query showing
+    one no longer narrows to the account's rows through an index. Scans of a
+    subquery's result (``SCAN (subquery-N)``) read rows the query already
+    narrowed, and are not reported.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        queries (Optional[list]): SQL to check; defaults to hot_queries(conn).
+    """
+    full_scans = []
+    cursor = conn.cursor()
+    for query in hot_queries(conn) if queries is None else queries:
+        params = (None,) * query.count("?")
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        for row in cursor.fetchall():
+            detail = row[-1]
+            if detail.startswith("SCAN ") and "CONSTANT ROW" not in detail and not detail.startswith("SCAN (subquery-"):
+                full_scans.append((query, detail))
+    return full_scans
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> list:
+    """Recompute transaction_rollups from the raw table and return any drift found.
+
+    Returns:
+        list: (account_id, type, category, month, rollup total, raw total) for
+        every key whose stored rollup disagreed with the raw transactions.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute(
+            f"""
+            WITH raw (account_id, type, category, month, total, count) AS ({_ROLLUP_SELECT_SQL})
+            SELECT r.account_id, r.type, r.category, r.month, r.total, raw.total
+            FROM transaction_rollups AS r
+            LEFT JOIN raw USING (account_id, type, category, month)
+            WHERE r.total IS NOT raw.total OR r.count IS NOT raw.count
+            UNION ALL
+            SELECT raw.account_id, raw.type, raw.category, raw.month, NULL, raw.total
+            FROM raw
+            LEFT JOIN transaction_rollups AS r USING (account_id, type, category, month)
+            WHERE r.account_id IS NULL
+            """
+        )
+        drift = cursor.fetchall()
+        cursor.execute("DELETE FROM transaction_rollups")
+        cursor.execute(_ROLLUP_REBUILD_SQL)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise RuntimeError(f"Database error: {e}")
+    return drift
 
 
 def create_or_open_database(db_name: str):
     """Create or open a database."""
     conn = sqlite3.connect(db_name)
+    # WAL lets background readers run while the UI thread writes.
+    conn.execute("PRAGMA journal_mode = WAL")
     create_tables(conn)
+    run_migrations(conn)
     return conn
+
+
+def main(argv: list = None) -> int:
+    """Command-line maintenance entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Budget Tracker database maintenance")
+    parser.add_argument("command", choices=["migrate", "check-plans", "rebuild-rollups"])
+    parser.add_argument("database", nargs="?", default="budget_tracker.db")
+    args = parser.parse_args(argv)
+
+    conn = create_or_open_database(args.database)
+    try:
+        if args.command == "migrate":
+            print(f"Schema version: {get_schema_version(conn)}")
+            return 0
+
+        if args.command == "rebuild-rollups":
+            drift = rebuild_rollups(conn)
+            for account_id, kind, category, month, stored, actual in drift:
+                print(f"account {account_id} {kind} {category!r} {month}: rollup {stored}, raw {actual}")
+            print(f"Rollups rebuilt; {len(drift)} mismatched key(s) corrected.")
+            return 1 if drift else 0
+
+        full_scans = find_full_scans(conn)
+        for query, detail in full_scans:
+            print(f"{detail}: {query}")
+        if not full_scans:
+            print("All hot queries use an index.")
+        return 1 if full_scans else 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,93 +1,260 @@
 import csv
+import os
+import secrets
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from src.utils.Database import get_account_id, fetch_data, fetch_total
+from itertools import islice
+from typing import Optional
+
+from src.utils.Currency import BASE_CURRENCY, RateService, default_provider
+from src.utils.Database import (
+    DEFAULT_BATCH_SIZE,
+    create_or_open_database,
+    fetch_data,
+    fetch_export_watermark,
+    get_account_id,
+    get_change_seq,
+    has_backdated_rows,
+    store_export_watermark,
+)
+from src.utils.Summary import TOP_K, compute_summary
 
 # Constants for CSV headers
 TRANSACTION_HEADERS = ["Category", "Amount", "Currency", "Date"]
 SUMMARY_HEADERS = ["Account Summary", "Total Income", "Total Expenses", "Net Income"]
 TOP_CATEGORIES_HEADERS = ["Category", "Amount"]
 
+# Columns read for each exported transaction: TRANSACTION_HEADERS order, then the id for the watermark.
+EXPORT_COLUMNS = ("category", "amount", "currency", "date", "id")
 
-def export_to_csv(account_name: str, conn) -> tuple:
+# File name suffix per transaction type.
+EXPORT_TARGETS = {"income": "income", "expense": "expenses"}
 
-    cursor = conn.cursor()
-    try:
-        account_id = get_account_id(cursor, account_name)
-        if account_id is None:
-            raise ValueError(f"Account '{account_name}' not found.")
 
-        income_file = export_transactions(
-            cursor, account_id, "income", f"{account_name}_income.csv"
-        )
-        expenses_file = export_transactions(
-            cursor, account_id, "expenses", f"{account_name}_expenses.csv"
+def export_to_csv(
+    account_name: str,
+    conn,
+    out_dir: str = ".",
+    rates: Optional[RateService] = None,
+    incremental: bool = False,
+) -> tuple:
+    """Export an account's income, expenses and summary to CSV files in ``out_dir``.
+
+    With ``rates``, summary amounts of mixed-currency accounts are converted to
+    BASE_CURRENCY. With ``incremental``, the transaction files only get the
+    rows added since the last export when possible (see export_transactions).
+
+    Returns:
+        tuple: (income file, expenses file, summary file) paths.
+    """
+    try:
+        account_id = get_account_id(conn, account_name)
+
+        income_file, expenses_file = (
+            export_transactions(
+                conn,
+                account_id,
+                transaction_type,
+                os.path.join(out_dir, f"{account_name}_{target}.csv"),
+                incremental=incremental,
+            )
+            for transaction_type, target in EXPORT_TARGETS.items()
         )
         summary_file = export_summary(
-            cursor, account_id, account_name, f"{account_name}_summary.csv"
+            conn, account_id, account_name, os.path.join(out_dir, f"{account_name}_summary.csv"), rates=rates
         )
 
         return income_file, expenses_file, summary_file
 
     except Exception as e:
         raise RuntimeError(f"Error exporting data: {e}")
-    finally:
-        cursor.close()
+
+
+@contextmanager
+def _atomic_csv_writer(filename: str):
+    """Yield a csv.writer over a temp file that replaces ``filename`` only if the block succeeds.
+
+    Readers see either the previous export or the complete new one, never a
+    partly written file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    temp_path = os.path.join(directory, f".{os.path.basename(filename)}.{secrets.token_hex(8)}.tmp")
+    # Created 0666 less the umask, as open() would create the export itself; mkstemp would make it 0600.
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as csvfile:
+            yield csv.writer(csvfile)
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+        # A file being replaced keeps its mode.
+        try:
+            os.chmod(temp_path, os.stat(filename).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _format_cents(cents: int) -> str:
+    """Same text as str(Money(cents)), without building a Decimal per row."""
+    units, rest = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{units}.{rest:02d}"
+
+
+def _write_rows(writer, rows, batch_size: int, last_key: tuple, max_id: int) -> tuple:
+    """Write (category, amount, currency, date, id) rows in batches.
+
+    Returns:
+        tuple: (rows written, (date, id) of the last row, largest id), falling
+        back to ``last_key`` and ``max_id`` when no rows are written.
+    """
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return count, last_key, max_id
+        writer.writerows(
+            (category, _format_cents(amount), currency, day) for category, amount, currency, day, _ in batch
+        )
+        count += len(batch)
+        last_key = (batch[-1][3], batch[-1][4])
+        max_id = max(max_id, max(row[4] for row in batch))
 
 
 def export_transactions(
-    cursor, account_id: int, transaction_type: str, filename: str
+    conn,
+    account_id: int,
+    transaction_type: str,
+    filename: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    incremental: bool = False,
 ) -> str:
+    """Stream one type of transaction into a CSV file in (date, id) order.
+
+    Rows go from SQLite to the file ``batch_size`` at a time, so memory use
+    stays the same however large the account is. The rows per second are
+    printed when the file is in place.
+
+    In incremental mode the file's watermark, the (date, id) of the last row
+    written and the largest id written, is kept in ``export_watermarks`` and
+    only rows after it are appended. The file is rewritten instead when there
+    is no watermark, the account's transactions were edited or deleted since
+    (the change sequence moved), a new row is dated before the last one
+    written, or the file is missing or not the size last written. Either way
+    the file ends up the same as a full export.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account to export.
+        transaction_type (str): "income" or "expense".
+        filename (str): Destination path; replaced atomically.
+        start_date (Optional[str]): Inclusive lower bound, YYYY-MM-DD.
+        end_date (Optional[str]): Inclusive upper bound, YYYY-MM-DD.
+        batch_size (int): Rows read and written per step.
+        incremental (bool): Append only new rows when possible; needs no date bounds.
+
+    Returns:
+        str: ``filename``.
+    """
     try:
-        query = f"SELECT category, amount, currency, date FROM {transaction_type} WHERE account_id = ? ORDER BY date"
-        transactions = fetch_data(cursor, query, (account_id,))
+        if incremental and (start_date is not None or end_date is not None):
+            raise ValueError("Incremental exports cover the whole account; drop the date range.")
+        start = time.perf_counter()
+        target = os.path.abspath(filename)
+        # One read transaction, so the change sequence, the backdated check and the rows come from the same
+        # snapshot; a commit landing mid-export then only moves the change sequence and forces a rewrite next time.
+        own_snapshot = not conn.in_transaction
+        if own_snapshot:
+            conn.execute("BEGIN")
+        rows = None
+        try:
+            change_seq = get_change_seq(conn, account_id)
+            watermark = fetch_export_watermark(conn, account_id, target) if incremental else None
+            append = (
+                watermark is not None
+                and watermark[0] == transaction_type
+                and watermark[3] == change_seq
+                and os.path.exists(filename)
+                and os.path.getsize(filename) == watermark[4]
+                and not has_backdated_rows(conn, account_id, transaction_type, watermark[2], watermark[1][0])
+            )
 
-        with open(filename, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(TRANSACTION_HEADERS)  # Header
-            writer.writerows(transactions)
+            if append:
+                rows = fetch_data(
+                    conn, account_id, EXPORT_COLUMNS, transaction_type, after=watermark[1], batch_size=batch_size
+                )
+                # A failed append leaves the file longer than its watermark says, so the next run rewrites it.
+                with open(filename, "a", newline="", encoding="utf-8") as csvfile:
+                    count, last_key, max_id = _write_rows(csv.writer(csvfile), rows, batch_size, *watermark[1:3])
+                    csvfile.flush()
+                    os.fsync(csvfile.fileno())
+            else:
+                rows = fetch_data(
+                    conn, account_id, EXPORT_COLUMNS, transaction_type, start_date, end_date, batch_size=batch_size
+                )
+                with _atomic_csv_writer(filename) as writer:
+                    writer.writerow(TRANSACTION_HEADERS)  # Header
+                    count, last_key, max_id = _write_rows(writer, rows, batch_size, ("", 0), 0)
+        finally:
+            if rows is not None:
+                rows.close()
+            if own_snapshot:
+                conn.commit()
+
+        if incremental:
+            store_export_watermark(
+                conn, account_id, target, transaction_type, last_key, max_id, change_seq, os.path.getsize(filename)
+            )
 
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'Appended' if append else 'Exported'} {count} {transaction_type} rows to {filename} "
+            f"in {elapsed:.2f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)"
+        )
         return filename
 
     except Exception as e:
         raise RuntimeError(f"Error exporting {transaction_type}: {e}")
 
 
-def export_summary(cursor, account_id: int, account_name: str, filename: str) -> str:
+def export_summary(
+    conn,
+    account_id: int,
+    account_name: str,
+    filename: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    rates: Optional[RateService] = None,
+) -> str:
+    """Write the account summary CSV from one compute_summary pass; amounts are in BASE_CURRENCY."""
     try:
-        total_income = fetch_total(cursor, "income", account_id)
-        total_expenses = fetch_total(cursor, "expenses", account_id)
-        net_income = total_income - total_expenses
-
-        # Fetch top 5 income categories
-        income_categories = fetch_data(
-            cursor,
-            "SELECT category, SUM(amount) as total FROM income WHERE account_id = ? GROUP BY category ORDER BY total DESC LIMIT 5",
-            (account_id,),
-        )
-
-        # Fetch top 5 expense categories
-        expense_categories = fetch_data(
-            cursor,
-            "SELECT category, SUM(amount) as total FROM expenses WHERE account_id = ? GROUP BY category ORDER BY total DESC LIMIT 5",
-            (account_id,),
-        )
+        summary = compute_summary(conn, account_id, rates, BASE_CURRENCY, start_date, end_date)
 
-        with open(filename, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
+        with _atomic_csv_writer(filename) as writer:
             writer.writerow([SUMMARY_HEADERS[0], account_name])
-            writer.writerow([SUMMARY_HEADERS[1], f"${total_income:.2f}"])
-            writer.writerow([SUMMARY_HEADERS[2], f"${total_expenses:.2f}"])
-            writer.writerow([SUMMARY_HEADERS[3], f"${net_income:.2f}"])
+            if start_date is not None or end_date is not None:
+                writer.writerow(["Date Range", f"{start_date or 'start'} to {end_date or 'today'}"])
+            writer.writerow([SUMMARY_HEADERS[1], f"${summary.income:.2f}"])
+            writer.writerow([SUMMARY_HEADERS[2], f"${summary.expenses:.2f}"])
+            writer.writerow([SUMMARY_HEADERS[3], f"${summary.net:.2f}"])
             writer.writerow([])
 
-            writer.writerow(["Top 5 Income Categories"])
+            writer.writerow([f"Top {TOP_K} Income Categories"])
             writer.writerow(TOP_CATEGORIES_HEADERS)
-            writer.writerows(income_categories)
+            writer.writerows(summary.top("income"))
             writer.writerow([])
 
-            writer.writerow(["Top 5 Expense Categories"])
+            writer.writerow([f"Top {TOP_K} Expense Categories"])
             writer.writerow(TOP_CATEGORIES_HEADERS)
-            writer.writerows(expense_categories)
+            writer.writerows(summary.top("expense"))
             writer.writerow([])
 
             writer.writerow(
@@ -100,122 +267,102 @@ def export_summary(cursor, account_id: int, account_name: str, filename: str) ->
         raise RuntimeError(f"Error exporting summary: {e}")
 
 
-def export_date_range(account_name: str, conn, start_date: str, end_date: str) -> tuple:
-    cursor = conn.cursor()
+def export_date_range(
+    account_name: str,
+    conn,
+    start_date: str,
+    end_date: str,
+    out_dir: str = ".",
+    rates: Optional[RateService] = None,
+) -> tuple:
+    """Export an account's transactions and summary between two inclusive YYYY-MM-DD dates."""
     try:
-        account_id = get_account_id(cursor, account_name)
-        if account_id is None:
-            raise ValueError(f"Account '{account_name}' not found.")
-
-        income_file = export_transactions_range(
-            cursor,
-            account_id,
-            "income",
-            start_date,
-            end_date,
-            f"{account_name}_income_{start_date}_{end_date}.csv",
-        )
-        expenses_file = export_transactions_range(
-            cursor,
-            account_id,
-            "expenses",
-            start_date,
-            end_date,
-            f"{account_name}_expenses_{start_date}_{end_date}.csv",
+        account_id = get_account_id(conn, account_name)
+        suffix = f"{start_date}_{end_date}"
+
+        income_file, expenses_file = (
+            export_transactions_range(
+                conn,
+                account_id,
+                transaction_type,
+                start_date,
+                end_date,
+                os.path.join(out_dir, f"{account_name}_{target}_{suffix}.csv"),
+            )
+            for transaction_type, target in EXPORT_TARGETS.items()
         )
         summary_file = export_summary_range(
-            cursor,
+            conn,
             account_id,
             account_name,
             start_date,
             end_date,
-            f"{account_name}_summary_{start_date}_{end_date}.csv",
+            os.path.join(out_dir, f"{account_name}_summary_{suffix}.csv"),
+            rates,
         )
 
         return income_file, expenses_file, summary_file
 
     except Exception as e:
         raise RuntimeError(f"Error exporting data for date range: {e}")
-    finally:
-        cursor.close()
 
 
 def export_transactions_range(
-    cursor,
+    conn,
     account_id: int,
     transaction_type: str,
     start_date: str,
     end_date: str,
     filename: str,
 ) -> str:
-    try:
-        query = f"SELECT category, amount, currency, date FROM {transaction_type} WHERE account_id = ? AND date BETWEEN ? AND ? ORDER BY date"
-        transactions = fetch_data(cursor, query, (account_id, start_date, end_date))
-
-        with open(filename, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(TRANSACTION_HEADERS)  # Header
-            writer.writerows(transactions)
-
-        return filename
-
-    except Exception as e:
-        raise RuntimeError(f"Error exporting {transaction_type} for date range: {e}")
+    return export_transactions(conn, account_id, transaction_type, filename, start_date, end_date)
 
 
 def export_summary_range(
-    cursor,
+    conn,
     account_id: int,
     account_name: str,
     start_date: str,
     end_date: str,
     filename: str,
+    rates: Optional[RateService] = None,
 ) -> str:
+    return export_summary(conn, account_id, account_name, filename, start_date, end_date, rates)
+
+
+def main(argv: list = None) -> int:
+    """Export accounts from the command line, e.g. from a nightly job."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export Budget Tracker accounts to CSV")
+    parser.add_argument("database")
+    parser.add_argument("accounts", nargs="+", help="usernames to export")
+    parser.add_argument("--out", default=".", help="output directory")
+    parser.add_argument("--incremental", action="store_true", help="append only rows added since the last export")
+    parser.add_argument(
+        "--rates-file",
+        default=os.environ.get("BUDGET_TRACKER_RATES_FILE"),
+        help="JSON exchange rates to refresh from instead of the web API",
+    )
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    conn = create_or_open_database(args.database)
     try:
-        total_income = fetch_total(cursor, "income", account_id, start_date, end_date)
-        total_expenses = fetch_total(
-            cursor, "expenses", account_id, start_date, end_date
-        )
-        net_income = total_income - total_expenses
-
-        # Fetch top 5 income categories for the date range
-        income_categories = fetch_data(
-            cursor,
-            "SELECT category, SUM(amount) as total FROM income WHERE account_id = ? AND date BETWEEN ? AND ? GROUP BY category ORDER BY total DESC LIMIT 5",
-            (account_id, start_date, end_date),
-        )
-
-        # Fetch top 5 expense categories for the date range
-        expense_categories = fetch_data(
-            cursor,
-            "SELECT category, SUM(amount) as total FROM expenses WHERE account_id = ? AND date BETWEEN ? AND ? GROUP BY category ORDER BY total DESC LIMIT 5",
-            (account_id, start_date, end_date),
-        )
-
-        with open(filename, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([SUMMARY_HEADERS[0], account_name])
-            writer.writerow(["Date Range", f"{start_date} to {end_date}"])
-            writer.writerow([SUMMARY_HEADERS[1], f"${total_income:.2f}"])
-            writer.writerow([SUMMARY_HEADERS[2], f"${total_expenses:.2f}"])
-            writer.writerow([SUMMARY_HEADERS[3], f"${net_income:.2f}"])
-            writer.writerow([])
-
-            writer.writerow(["Top 5 Income Categories"])
-            writer.writerow(TOP_CATEGORIES_HEADERS)
-            writer.writerows(income_categories)
-            writer.writerow([])
-
-            writer.writerow(["Top 5 Expense Categories"])
-            writer.writerow(TOP_CATEGORIES_HEADERS)
-            writer.writerows(expense_categories)
-            writer.writerow([])
-
-            writer.writerow(
-                ["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-            )
+        # Summaries of mixed-currency accounts need rates; the stored ones work offline.
+        rates = RateService(default_provider(args.rates_file))
+        rates.load(conn)
+        if rates.is_stale():
+            rates.refresh(conn)
+        for account_name in args.accounts:
+            export_to_csv(account_name, conn, args.out, rates, incremental=args.incremental)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        conn.close()
+    return 0
 
-        return filename
 
-    except Exception as e:
-        raise RuntimeError(f"Error exporting summary for date range: {e}")
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Union
+
+# Amounts are stored as integer minor units (cents) so SQLite sums them exactly.
+CENTS_PER_UNIT = 100
+# SQLite INTEGER is a signed 64-bit value.
+MIN_CENTS, MAX_CENTS = -(2**63), 2**63 - 1
+_CENT = Decimal("0.01")
+
+
+class Money:
+    """An exact monetary amount held as integer cents."""
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents: int) -> None:
+        self.cents = int(cents)
+
+    @classmethod
+    def parse(cls, value: Union[str, int, float, Decimal]) -> "Money":
+        """Parse user input such as "12.5" into Money, rounding half up to the cent.
+
+        Raises:
+            ValueError: If the value is not a finite number.
+        """
+        try:
+            amount = Decimal(str(value).strip())
+            if not amount.is_finite():
+                raise ValueError(f"Invalid amount: {value!r}")
+            # quantize raises InvalidOperation when the result needs more digits than the context allows.
+            return cls(int(amount.quantize(_CENT, rounding=ROUND_HALF_UP) * CENTS_PER_UNIT))
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}")
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents) / CENTS_PER_UNIT
+
+    def __float__(self) -> float:
+        return self.cents / CENTS_PER_UNIT
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.to_decimal(), format_spec or ".2f")
+
+    def __str__(self) -> str:
+        return format(self, ".2f")
+
+    def __repr__(self) -> str:
+        return f"Money({self})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Money) and self.cents == other.cents
+
+    def __lt__(self, other: "Money") -> bool:
+        return self.cents < other.cents
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+    def __add__(self, other: "Money") -> "Money":
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: "Money") -> "Money":
+        return Money(self.cents - other.cents)
+
+
+def cents_to_units(values) -> "np.ndarray":
+    """Convert a sequence of integer cents to float currency units in one step."""
+    import numpy as np
+
+    return np.asarray(values, dtype=np.int64) / CENTS_PER_UNIT
@@ -0,0 +1,130 @@
+from collections import deque
+
+import customtkinter as ctk
+
+# How long a toast stays up once nothing else is waiting.
+TOAST_DURATION_MS = 3000
+
+# Each message stays up at least this long before a queued one replaces it.
+MIN_DISPLAY_MS = 800
+
+# Messages waiting beyond this are dropped, oldest first.
+MAX_QUEUED = 5
+
+TEXT_COLORS = {
+    "error": "red",
+    "success": "green",
+}
+
+
+class NotificationManager:
+    """Shows messages in one reusable toast window at the bottom right of the root.
+
+    Messages that arrive while a toast is up wait in a bounded queue and are
+    shown one after another, each for at least MIN_DISPLAY_MS. A message equal
+    to the one showing or one already queued is merged into it with a repeat
+    count instead of being queued again, so a burst of identical results shows
+    as a single toast.
+    """
+
+    def __init__(self, root) -> None:
+        self.root = root
+        self.toast = None
+        self.label = None
+        self.dropped = 0
+        self._queue = deque()
+        self._current = None
+        self._hide_id = None
+        self._next_id = None
+        # One binding for the app's lifetime; it only moves the toast.
+        root.bind("<Configure>", self._on_root_configure, add="+")
+
+    def notify(self, message: str, message_type: str = "info") -> None:
+        """Queue a message; it is shown immediately if no toast is up."""
+        key = (message, message_type)
+        if self._current is not None and self._current[0] == key:
+            self._current[1] += 1
+            self._show_current()
+            return
+        for entry in self._queue:
+            if entry[0] == key:
+                entry[1] += 1
+                return
+        if len(self._queue) >= MAX_QUEUED:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append([key, 1])
+        if self._next_id is None:
+            # Nothing showing, or the current toast has had its minimum time.
+            self._show_next()
+
+    def _show_next(self) -> None:
+        self._next_id = None
+        if not self._queue:
+            return
+        self._current = self._queue.popleft()
+        self._show_current()
+        self._next_id = self.root.after(MIN_DISPLAY_MS, self._advance)
+
+    def _advance(self) -> None:
+        """Called once the current toast has had its minimum time on screen."""
+        self._next_id = None
+        if self._queue:
+            self._show_next()
+
+    def _show_current(self) -> None:
+        (message, message_type), count = self._current
+        if count > 1:
+            message = f"{message} (x{count})"
+        toast = self._ensure_toast()
+        self.label.configure(text=message, text_color=TEXT_COLORS.get(message_type, "white"))
+        toast.deiconify()
+        toast.lift()
+        # Position once the new text has been laid out, without forcing an update.
+        toast.after_idle(self._place)
+        if self._hide_id is not None:
+            self.root.after_cancel(self._hide_id)
+        self._hide_id = self.root.after(TOAST_DURATION_MS, self._hide)
+
+    def _hide(self) -> None:
+        self._hide_id = None
+        if self._queue:
+            self._show_next()
+            return
+        self._current = None
+        if self.toast is not None:
+            self.toast.withdraw()
+
+    def _ensure_toast(self) -> ctk.CTkToplevel:
+        if self.toast is None or not self.toast.winfo_exists():
+            self.toast = ctk.CTkToplevel(self.root)
+            self.toast.overrideredirect(True)  # Remove window decorations (close, minimize, etc.)
+            self.toast.configure(fg_color="#000000")
+            self.label = ctk.CTkLabel(
+                self.toast,
+                text="",
+                text_color="white",
+                fg_color="#1E90FF",
+                bg_color="#000000",
+                font=("Arial", 12, "bold"),
+                corner_radius=8,
+                padx=10,
+                pady=5
+            )
+            self.label.pack(expand=True, fill="both", padx=10, pady=10)
+        return self.toast
+
+    def _place(self) -> None:
+        """Move the toast to the bottom-right corner of the root window."""
+        if self.toast is None or self._current is None:
+            return
+        width = max(self.label.winfo_reqwidth() + 20, 250)
+        height = max(self.label.winfo_reqheight() + 20, 50)
+        x = self.root.winfo_x() + self.root.winfo_width() - width - 20
+        y = self.root.winfo_y() + self.root.winfo_height() - height - height // 2
+        self.toast.geometry(f"{width}x{height}+{x}+{y}")
+
+    def _on_root_configure(self, event) -> None:
+        # Every child widget's <Configure> also reaches the root's binding; only the root moves the toast.
+        if event.widget is self.root and self._current is not None:
+            self._place()
@@ -0,0 +1,270 @@
+"""Headless batch rendering of per-account chart reports.
+
+Run from the repository root:
+
+    python -m src.utils.Reports budget_tracker.db --out reports --format png pdf --month 2024-10
+
+Every account (or those named with --accounts) gets a directory
+``<out>/<account id>-<username>/`` holding bar, pie and line charts in each
+requested format plus ``summary.txt``; ``<out>/index.csv`` lists the totals
+for all accounts in account-ID order. Amounts are converted to the base
+currency at each transaction's date. Accounts are spread over a process
+pool and the time spent in each stage is printed at the end.
+"""
+import argparse
+import calendar
+import csv
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from src.utils.Currency import BASE_CURRENCY, RateService, default_provider
+from src.utils.Database import TIME_BUCKETS, create_or_open_database
+from src.utils.Money import Money
+from src.utils.Summary import AccountSummary, compute_summary, compute_time_series
+from src.utils.Visualization import SAVE_METADATA, ChartFigure
+
+STAGES = ("fetch", "build", "save", "summary")
+CHART_TYPES = ("bar", "pie", "line")
+
+# Fixed pixel size so a report looks the same on every machine.
+REPORT_SIZE = (1200, 700)
+
+_worker_conn = None
+_worker_rates = None
+
+
+def account_directory(account_id: int, username: str) -> str:
+    """Directory name for an account: stable, sortable and safe on any file system."""
+    return f"{account_id:06d}-{re.sub(r'[^A-Za-z0-9._-]', '_', username)}"
+
+
+def month_range(month: str) -> tuple:
+    """First and last ISO date of a YYYY-MM month."""
+    year, month_number = (int(part) for part in month.split("-"))
+    last_day = calendar.monthrange(year, month_number)[1]
+    return f"{month}-01", f"{month}-{last_day:02d}"
+
+
+def _init_worker(db_name: str) -> None:
+    global _worker_conn, _worker_rates
+    _worker_conn = sqlite3.connect(db_name)
+    # render_reports refreshed the stored rates already; workers only read them.
+    _worker_rates = RateService(default_provider())
+    _worker_rates.load(_worker_conn)
+
+
+def render_account(job: tuple) -> tuple:
+    """Write one account's charts and summary. Runs in a pool worker.
+
+    Args:
+        job (tuple): (account_id, username, out_dir, formats, month, bucket).
+
+    Amounts in other currencies are converted to BASE_CURRENCY, each at its
+    own day's rate.
+
+    Returns:
+        tuple: (account_id, username, income cents, expense cents, {stage: seconds}).
+    """
+    account_id, username, out_dir, formats, month, bucket = job
+    timings = dict.fromkeys(STAGES, 0.0)
+    directory = os.path.join(out_dir, account_directory(account_id, username))
+    os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    start_date, end_date = month_range(month) if month else (None, None)
+    summary = compute_summary(_worker_conn, account_id, _worker_rates, BASE_CURRENCY, start_date, end_date)
+    income, expenses = summary.category_series("income"), summary.category_series("expense")
+    dates, income_series, expense_series = compute_time_series(
+        _worker_conn, account_id, bucket, _worker_rates, BASE_CURRENCY, start_date, end_date
+    )
+    timings["fetch"] = time.perf_counter() - start
+
+    charts = []
+    if income[0]:
+        charts.append(("bar", (*income, "Income by Category")))
+    if expenses[0]:
+        charts.append(("pie", (*expenses, "Expenses by Category")))
+    if income_series.any() or expense_series.any():
+        charts.append((
+            "line",
+            (
+                (dates, income_series) if income_series.any() else ((), ()),
+                (dates, expense_series) if expense_series.any() else ((), ()),
+            ),
+        ))
+
+    # The directory may hold an earlier run's charts; drop any this run will not rewrite.
+    drawn = {chart_type for chart_type, _ in charts}
+    for chart_type in CHART_TYPES:
+        for file_format in formats:
+            if chart_type not in drawn:
+                try:
+                    os.remove(os.path.join(directory, f"{chart_type}.{file_format}"))
+                except FileNotFoundError:
+                    pass
+
+    for chart_type, data in charts:
+        start = time.perf_counter()
+        # A fresh figure per chart keeps the output independent of what the worker drew before.
+        chart = ChartFigure()
+        chart.resize(*REPORT_SIZE)
+        chart.update(chart_type, data)
+        timings["build"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for file_format in formats:
+            chart.save(os.path.join(directory, f"{chart_type}.{file_format}"), file_format)
+        timings["save"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_summary(os.path.join(directory, "summary.txt"), username, month, summary, [name for name, _ in charts])
+    timings["summary"] = time.perf_counter() - start
+    return account_id, username, summary.income.cents, summary.expenses.cents, timings
+
+
+def write_summary(path: str, username: str, month: Optional[str], summary: AccountSummary, charts: list) -> None:
+    """Write the plain-text summary for one account."""
+    lines = [
+        f"Account: {username}",
+        f"Period: {month or 'All time'}",
+        f"Currency: {summary.currency}",
+        f"Total Income: {summary.income}",
+        f"Total Expenses: {summary.expenses}",
+        f"Balance: {summary.net}",
+    ]
+    for heading, transaction_type in (("Income by Category", "income"), ("Expenses by Category", "expense")):
+        lines += ["", heading]
+        rows = summary.top(transaction_type, k=len(summary.category_totals[transaction_type]))
+        lines += [f"  {category}: {total}" for category, total in rows] or ["  (none)"]
+    lines += ["", f"Charts: {', '.join(charts) or 'none (no transactions)'}"]
+    with open(path, "w", encoding="utf-8", newline="\n") as summary_file:
+        summary_file.write("\n".join(lines) + "\n")
+
+
+def select_accounts(conn: sqlite3.Connection, usernames: Optional[list] = None) -> list:
+    """Return (id, username) for the named accounts, or for all accounts, in ID order."""
+    rows = conn.execute("SELECT id, username FROM accounts ORDER BY id").fetchall()
+    if not usernames:
+        return rows
+    wanted = set(usernames)
+    missing = wanted - {username for _, username in rows}
+    if missing:
+        raise ValueError(f"Unknown accounts: {', '.join(sorted(missing))}")
+    return [row for row in rows if row[1] in wanted]
+
+
+def render_reports(
+    db_name: str,
+    out_dir: str,
+    formats: tuple = ("png",),
+    usernames: Optional[list] = None,
+    month: Optional[str] = None,
+    bucket: Optional[str] = None,
+    workers: Optional[int] = None,
+    rates_file: Optional[str] = None,
+) -> dict:
+    """Render reports for many accounts in parallel.
+
+    Args:
+        db_name (str): Path to the SQLite database.
+        out_dir (str): Directory the report tree is written under.
+        formats (tuple): Any of "png", "svg" and "pdf".
+        usernames (Optional[list]): Accounts to include; all of them if omitted.
+        month (Optional[str]): Limit the report to one YYYY-MM month.
+        bucket (Optional[str]): Line chart time bucket; "day" for a month, "month" otherwise.
+        workers (Optional[int]): Process count; defaults to the number of CPUs.
+        rates_file (Optional[str]): JSON exchange rates to refresh stale rates from instead of the web API.
+
+    Returns:
+        dict: Stage name to total seconds across all workers, plus "wall" and "accounts".
+    """
+    unsupported = set(formats) - set(SAVE_METADATA)
+    if unsupported:
+        raise ValueError(f"Unsupported formats: {', '.join(sorted(unsupported))}")
+    bucket = bucket or ("day" if month else "month")
+    if month:
+        month_range(month)
+
+    # Migrate here, once, so workers can rely on the rollup table and indexes existing.
+    conn = create_or_open_database(db_name)
+    try:
+        accounts = select_accounts(conn, usernames)
+        # Likewise refresh stale rates once; if that fails the workers convert with the last stored ones.
+        rates = RateService(default_provider(rates_file))
+        rates.load(conn)
+        if rates.is_stale():
+            rates.refresh(conn)
+    finally:
+        conn.close()
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(account_id, username, out_dir, tuple(formats), month, bucket) for account_id, username in accounts]
+    totals = dict.fromkeys(STAGES, 0.0)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(db_name,)) as executor:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(render_account, jobs, chunksize=chunksize))
+
+    with open(os.path.join(out_dir, "index.csv"), "w", newline="", encoding="utf-8") as index_file:
+        writer = csv.writer(index_file, lineterminator="\n")
+        writer.writerow(["Account ID", "Account", "Total Income", "Total Expenses", "Balance", "Currency"])
+        for account_id, username, income_total, expense_total, timings in results:
+            income, expenses = Money(income_total), Money(expense_total)
+            writer.writerow([account_id, username, income, expenses, income - expenses, BASE_CURRENCY])
+            for stage, seconds in timings.items():
+                totals[stage] += seconds
+
+    totals["wall"] = time.perf_counter() - start
+    totals["accounts"] = len(results)
+    return totals
+
+
+def print_timings(totals: dict) -> None:
+    accounts = totals["accounts"] or 1
+    print(f"{'stage':>8} {'total':>10} {'per account':>12}")
+    for stage in STAGES:
+        print(f"{stage:>8} {totals[stage]:>9.2f}s {1000 * totals[stage] / accounts:>10.1f}ms")
+    print(f"{totals['accounts']} account(s) in {totals['wall']:.2f}s wall time")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Render chart reports for Budget Tracker accounts")
+    parser.add_argument("database", nargs="?", default="budget_tracker.db")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=sorted(SAVE_METADATA))
+    parser.add_argument("--accounts", nargs="+", help="usernames to include (default: all)")
+    parser.add_argument("--month", help="limit the report to one YYYY-MM month")
+    parser.add_argument("--bucket", choices=TIME_BUCKETS, help="line chart time bucket")
+    parser.add_argument("--workers", type=int, help="number of processes (default: CPU count)")
+    parser.add_argument(
+        "--rates-file",
+        default=os.environ.get("BUDGET_TRACKER_RATES_FILE"),
+        help="JSON exchange rates to refresh from instead of the web API",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        totals = render_reports(
+            args.database,
+            args.out,
+            args.format,
+            args.accounts,
+            args.month,
+            args.bucket,
+            args.workers,
+            args.rates_file,
+        )
+    except (ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    print_timings(totals)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
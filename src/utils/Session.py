@@ -0,0 +1,29 @@
+import threading
+
+from src.utils.Database import get_account_id
+
+
+class Session:
+    """State for the logged-in user: account identity and resolved account IDs.
+
+    Query results are cached per connection by QueryCache, which notices
+    writes itself. Methods may be called from worker threads.
+    """
+
+    def __init__(self, account_id: int, username: str) -> None:
+        self.account_id = account_id
+        self.username = username
+        self._account_ids = {username: account_id}
+        self._lock = threading.Lock()
+
+    def resolve_account(self, conn, account_name: str) -> int:
+        """Return the ID for an account name, querying SQLite only the first time.
+
+        Accounts are never renamed or deleted, so a resolved ID never goes stale.
+        """
+        account_id = self._account_ids.get(account_name)
+        if account_id is None:
+            account_id = get_account_id(conn, account_name)
+            with self._lock:
+                self._account_ids[account_name] = account_id
+        return account_id
@@ -0,0 +1,156 @@
+import heapq
+from typing import Optional
+
+from src.utils.Currency import BASE_CURRENCY, RateService, round_cents
+from src.utils.Database import (
+    TRANSACTION_TYPES,
+    fetch_account_currencies,
+    fetch_category_sums,
+    fetch_time_series,
+    fill_time_buckets,
+)
+from src.utils.Money import Money
+
+# Categories listed per transaction type in summaries.
+TOP_K = 5
+
+
+class AccountSummary:
+    """Income and expense totals, net and per-category totals for one account, in one currency.
+
+    Built by compute_summary and shared by the CSV summary, the Summary page
+    and Budget Analysis, so they all show the same numbers.
+    """
+
+    def __init__(self, currency: str, category_totals: dict, income: Money, expenses: Money) -> None:
+        self.currency = currency
+        # {transaction type: {category: Money}}
+        self.category_totals = category_totals
+        self.income = income
+        self.expenses = expenses
+
+    @property
+    def net(self) -> Money:
+        return self.income - self.expenses
+
+    def category_series(self, transaction_type: str) -> tuple:
+        """(totals in cents, categories) in category order, shaped like fetch_category_totals for the charts."""
+        items = sorted(self.category_totals[transaction_type].items())
+        return [total.cents for _, total in items], [category for category, _ in items]
+
+    def top(self, transaction_type: str, k: int = TOP_K) -> list:
+        """The ``k`` largest categories as (category, Money), largest first and ties by name."""
+        return heapq.nsmallest(
+            k,
+            self.category_totals[transaction_type].items(),
+            key=lambda item: (-item[1].cents, item[0]),
+        )
+
+
+def compute_summary(
+    conn,
+    account_id: int,
+    rates: Optional[RateService] = None,
+    currency: str = BASE_CURRENCY,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    cache=None,
+) -> AccountSummary:
+    """Summarize an account with one grouped query.
+
+    When every transaction is already in ``currency`` (or no ``rates`` are
+    given, in which case amounts are summed as stored) the sums come from
+    the rollups for whole-month ranges. Otherwise they are grouped by
+    currency and day as well and converted with ``rates``, each at its own
+    day's rate.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        account_id (int): The account ID.
+        rates (Optional[RateService]): Rates to convert mixed-currency accounts with.
+        currency (str): Currency of the returned amounts.
+        start_date (Optional[str]): First ISO date to include.
+        end_date (Optional[str]): Last ISO date to include.
+        cache (Optional[QueryCache]): Cache to read through instead of ``conn``.
+
+    Returns:
+        AccountSummary: The summary.
+
+    Raises:
+        ValueError: If a currency in the account has no known rate.
+    """
+    category_totals = {transaction_type: {} for transaction_type in TRANSACTION_TYPES}
+    if rates is None or fetch_account_currencies(conn, account_id, cache) <= {currency}:
+        type_totals = dict.fromkeys(TRANSACTION_TYPES, 0)
+        rows = fetch_category_sums(conn, account_id, start_date, end_date, cache=cache)
+        for transaction_type, category, cents in rows:
+            category_totals[transaction_type][category] = Money(cents)
+            type_totals[transaction_type] += cents
+        return AccountSummary(currency, category_totals, Money(type_totals["income"]), Money(type_totals["expense"]))
+
+    import numpy as np
+
+    rows = fetch_category_sums(conn, account_id, start_date, end_date, by_currency=True, cache=cache)
+    sums = {}
+    type_sums = dict.fromkeys(TRANSACTION_TYPES, 0.0)
+    if rows:
+        types, categories, currencies, days, cents = zip(*rows)
+        converted = rates.convert_amounts(
+            np.array(currencies), np.array(days, dtype=np.int64), np.array(cents, dtype=np.int64), currency
+        )
+        for transaction_type, category, value in zip(types, categories, converted.tolist()):
+            key = (transaction_type, category)
+            sums[key] = sums.get(key, 0.0) + value
+            type_sums[transaction_type] += value
+    for (transaction_type, category), value in sums.items():
+        category_totals[transaction_type][category] = round_cents(value)
+    # Totals are rounded once, not summed from the rounded category totals.
+    return AccountSummary(
+        currency, category_totals, round_cents(type_sums["income"]), round_cents(type_sums["expense"])
+    )
+
+
+def compute_time_series(
+    conn,
+    account_id: int,
+    bucket: str = "day",
+    rates: Optional[RateService] = None,
+    currency: str = BASE_CURRENCY,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    cache=None,
+) -> tuple:
+    """Income and expense per time bucket in one currency, for the line chart.
+
+    Accounts entirely in ``currency`` (or any account without ``rates``) are
+    read by fetch_time_series. Otherwise the sums per currency and day are
+    converted at each day's rate before they are bucketed.
+
+    Returns:
+        tuple: (bucket start dates as datetime64[D], income cents, expense cents) as NumPy arrays.
+
+    Raises:
+        ValueError: If a currency in the account has no known rate.
+    """
+    if rates is None or fetch_account_currencies(conn, account_id, cache) <= {currency}:
+        return fetch_time_series(conn, account_id, bucket, start_date, end_date, cache)
+
+    import numpy as np
+
+    rows = fetch_category_sums(conn, account_id, start_date, end_date, by_currency=True, cache=cache)
+    # Undated rows have no day to convert at or plot on; fetch_time_series leaves them out too.
+    rows = sorted((row for row in rows if row[3] is not None), key=lambda row: row[3])
+    types, _, currencies, days, cents = (np.array(column) for column in zip(*rows)) if rows else ([],) * 5
+    days = np.asarray(days, dtype=np.int64)
+    converted = rates.convert_amounts(np.asarray(currencies), days, np.asarray(cents, dtype=np.int64), currency)
+    is_income = np.asarray(types) == "income"
+    starts, income, expense = fill_time_buckets(
+        days.astype("datetime64[D]"),
+        np.where(is_income, converted, 0.0),
+        np.where(is_income, 0.0, converted),
+        bucket,
+        start_date,
+        end_date,
+    )
+    # Rounded half up once per bucket, like round_cents.
+    return starts, np.floor(income + 0.5).astype(np.int64), np.floor(expense + 0.5).astype(np.int64)
@@ -0,0 +1,180 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.utils.Database import QueryCache
+
+# How often the Tk main loop checks for finished background work (~60 fps).
+POLL_INTERVAL_MS = 16
+
+# How long a worker connection waits on a locked database before failing.
+BUSY_TIMEOUT_MS = 5000
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed it was cancelled or superseded."""
+
+
+class TaskHandle:
+    """A submitted task. Cancelling it stops a pending start and drops its result."""
+
+    def __init__(self, key: Optional[str]) -> None:
+        self.key = key
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+
+class TaskContext:
+    """What a task function receives: its worker's database connection and cancel state."""
+
+    def __init__(self, runner: "TaskRunner", handle: TaskHandle) -> None:
+        self._runner = runner
+        self._handle = handle
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        return self._runner._thread_connection()
+
+    @property
+    def cache(self) -> QueryCache:
+        """Read-query cache over this worker's connection."""
+        self._runner._thread_connection()
+        return self._runner._local.cache
+
+    @property
+    def cancelled(self) -> bool:
+        return self._handle.cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self._handle.cancelled:
+            raise TaskCancelled()
+
+
+class TaskRunner:
+    """Runs blocking work on a thread pool and delivers results on the Tk main loop.
+
+    Each worker thread lazily opens its own SQLite connection and query cache,
+    so tasks never share the UI thread's connection. Tasks submitted with the same ``key``
+    coalesce: a newer submission cancels the older one and only the latest
+    result is delivered.
+    """
+
+    def __init__(self, root, db_name: Optional[str] = None, max_workers: int = 4) -> None:
+        self.root = root
+        self.db_name = db_name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="budget-tracker")
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._results = queue.SimpleQueue()
+        self._latest = {}
+        self._pending = 0
+        self._poll_id = None
+
+    def submit(
+        self,
+        func: Callable,
+        on_success: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        key: Optional[str] = None,
+    ) -> TaskHandle:
+        """Run ``func(context)`` on a worker thread.
+
+        Args:
+            func (Callable): The blocking work; receives a TaskContext. Must not touch Tk widgets.
+            on_success (Optional[Callable]): Called on the main loop with the result.
+            on_error (Optional[Callable]): Called on the main loop with the exception.
+            key (Optional[str]): Coalescing key; a newer task with the same key supersedes this one.
+
+        Returns:
+            TaskHandle: Handle that can cancel the task.
+        """
+        handle = TaskHandle(key)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = handle
+
+        self._pending += 1
+        self._executor.submit(self._run, handle, func, on_success, on_error)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(POLL_INTERVAL_MS, self._deliver)
+        return handle
+
+    def cancel(self, key: str) -> None:
+        """Cancel the latest task submitted under ``key``, if any."""
+        handle = self._latest.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self) -> None:
+        """Stop accepting work, drop queued tasks and close worker connections."""
+        for handle in self._latest.values():
+            handle.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.db_name is None:
+                raise RuntimeError("This task runner has no database configured.")
+            # Only the owning worker uses it; check_same_thread is off so shutdown can close it.
+            conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+            self._local.cache = QueryCache(conn)
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _run(self, handle: TaskHandle, func: Callable, on_success, on_error) -> None:
+        """Worker side: run the task unless it was cancelled while queued."""
+        if handle.cancelled:
+            self._results.put((handle, None, None, None))
+            return
+        try:
+            result = func(TaskContext(self, handle))
+            self._results.put((handle, on_success, result, None))
+        except TaskCancelled:
+            self._results.put((handle, None, None, None))
+        except Exception as e:
+            self._results.put((handle, on_error, None, e))
+
+    def _deliver(self) -> None:
+        """Main-loop side: hand finished results to their callbacks."""
+        while True:
+            try:
+                handle, callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if handle.key is not None and self._latest.get(handle.key) is handle:
+                del self._latest[handle.key]
+            if handle.cancelled:
+                continue
+            if callback is None:
+                if error is not None:
+                    print(f"Background task failed: {error}")
+                continue
+            try:
+                callback(error if error is not None else result)
+            except Exception as e:
+                print(f"Error in task callback: {e}")
+
+        if self._pending:
+            self._poll_id = self.root.after(POLL_INTERVAL_MS, self._deliver)
+        else:
+            self._poll_id = None
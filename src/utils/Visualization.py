@@ -1,18 +1,97 @@
 import logging
-import time
+import tkinter as tk
+from collections import OrderedDict
 import numpy as np
-from datetime import datetime
-from typing import Tuple, Any
+from typing import Tuple, Any, Hashable, Optional
 import customtkinter as ctk
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.dates as mdates
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.patches import Circle
+from matplotlib.ticker import FuncFormatter
+from PIL import Image, ImageTk
+
+from src.utils.Money import cents_to_units
+from src.utils.Tasks import TaskRunner
+
+BACKGROUND_COLOR = "#000000"
+DEFAULT_SIZE = (1200, 700)
+CHART_PADDING = 15
+
+# Resize events closer together than this are coalesced into one redraw.
+RESIZE_SETTLE_MS = 150
+
+# Upper bound on rendered chart bitmaps kept per chart slot (a 1200x700 chart is ~3.4 MB).
+DEFAULT_BITMAP_CACHE_BYTES = 64 * 1024 * 1024
+
+# Geometry shared by the pie chart's first draw and its in-place updates.
+PIE_START_ANGLE = 90
+PIE_PCT_DISTANCE = 0.75
+PIE_LABEL_DISTANCE = 1.2
+
+# Line series longer than this are downsampled to the chart width and only
+# their extrema and latest point are labelled.
+LARGE_SERIES_POINTS = 500
+
+# File formats ChartFigure.save writes, with metadata that keeps the output reproducible.
+SAVE_METADATA = {
+    "png": {},
+    "svg": {"Date": None},
+    "pdf": {"CreationDate": None},
+}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Pick ``threshold`` indices that preserve the shape of a series.
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept and
+    each bucket in between contributes the point forming the largest
+    triangle with the previously chosen point and the next bucket's mean.
+
+    Args:
+        x (np.ndarray): Ascending x values as numbers.
+        y (np.ndarray): Y values of the same length.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices into ``x`` and ``y``.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
 
 
 def create_figure() -> Tuple[Figure, Any]:
-    """Create a figure with DPI-aware sizing"""
-    fig = plt.figure(figsize=(12, 7), dpi=100)
+    """Create a figure with DPI-aware sizing.
+
+    Uses the object-oriented API, so the figure is not registered with
+    pyplot and is freed as soon as nothing references it.
+    """
+    fig = Figure(figsize=(DEFAULT_SIZE[0] / 100, DEFAULT_SIZE[1] / 100), dpi=100)
+    FigureCanvasAgg(fig)
     ax = fig.add_subplot(111)
     return fig, ax
 
@@ -20,217 +99,557 @@ def setup_figure_style(fig: Figure, ax: Any, title: str) -> None:
     background_color = "#000000"
     text_color = "white"
     grid_color = "gray"
-    
+
     ax.set_facecolor(background_color)
     fig.patch.set_facecolor("#000000")  # Changed to black background
-    
-    ax.set_title(title, 
+
+    ax.set_title(title,
                  fontsize=18,
-                 color=text_color, 
+                 color=text_color,
                  pad=15,
                  loc='center',
                  fontweight='bold')
-    
+
     for spine in ax.spines.values():
         spine.set_color(grid_color)
         spine.set_linewidth(0.5)
-    
-    ax.grid(True, 
-            linestyle='--', 
-            alpha=0.2, 
+
+    ax.grid(True,
+            linestyle='--',
+            alpha=0.2,
             color=grid_color,
             which='both')
-    
-    ax.tick_params(colors=text_color, 
+
+    ax.tick_params(colors=text_color,
                   which='both',
                   length=5,
                   width=0.5)
 
-def plot_bar_chart(data: list, labels: list, title: str, parent) -> None:
-    try:
-        fig, ax = create_figure()
-        
-        bars = ax.bar(labels, 
-                     data,
-                     color='#1E90FF',
-                     alpha=0.7,
-                     width=0.6)
-      
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2.,
-                   height + (max(data) * 0.02),
-                   f'${height:,.0f}',
-                   ha='center',
-                   va='bottom',
-                   color='white',
-                   fontsize=10,
-                   fontweight='bold')
-        
-        ax.set_ylim(0, max(data) * 1.15)
-        
+
+class ChartFigure:
+    """A reusable off-screen figure for one chart slot.
+
+    ``update`` changes the existing artists in place (bar heights, wedge
+    angles, line data) when the chart type and its categories are unchanged,
+    and otherwise clears and rebuilds the axes on the same figure. No new
+    figure or canvas is ever created, so memory stays flat across updates.
+    Nothing here touches Tk, so it can be drawn on a worker thread.
+    """
+
+    def __init__(self, large_series_points: int = LARGE_SERIES_POINTS) -> None:
+        self.large_series_points = large_series_points
+        self.figure, self.ax = create_figure()
+        self.canvas = self.figure.canvas
+        self.chart_type = None
+        self.data = None
+        self._artists = {}
+        self._layout_stale = True
+
+    def resize(self, width: int, height: int) -> None:
+        """Set the pixel size the next render will produce."""
+        dpi = self.figure.dpi
+        if self.canvas.get_width_height() != (width, height):
+            self.figure.set_size_inches(width / dpi, height / dpi)
+            self._layout_stale = True
+            if self.chart_type == "line" and self._artists.get("large"):
+                # Downsampling depends on the width.
+                self._update_line(*self.data)
+
+    def update(self, chart_type: str, data: tuple) -> None:
+        """Show ``data`` as ``chart_type`` ("bar", "pie" or "line")."""
+        if chart_type == self.chart_type and data is self.data:
+            return
+        updater = getattr(self, f"_update_{chart_type}")
+        self.data = data
+        if self.chart_type == chart_type and updater(*data):
+            return
+        self.ax.clear()
+        # clear() keeps the pie's equal aspect, which would squash bar and line charts.
+        self.ax.set_aspect("auto")
+        self._artists = {}
+        getattr(self, f"_build_{chart_type}")(*data)
+        self.chart_type = chart_type
+        self._layout_stale = True
+
+    def render(self) -> Tuple[int, int, bytes]:
+        """Draw with Agg and return (width, height, RGBA bytes)."""
+        self._apply_layout()
+        self.canvas.draw()
+        width, height = self.canvas.get_width_height()
+        return width, height, bytes(self.canvas.buffer_rgba())
+
+    def save(self, path: str, file_format: str) -> None:
+        """Write the chart to a PNG, SVG or PDF file whose bytes depend only on the data."""
+        if file_format not in SAVE_METADATA:
+            raise ValueError(f"Unsupported chart format: {file_format!r}")
+        self._apply_layout()
+        # SVG element IDs are random unless salted; dates are left out of SVG and PDF.
+        with matplotlib.rc_context({"svg.hashsalt": "budget-tracker"}):
+            self.figure.savefig(path,
+                                format=file_format,
+                                facecolor=self.figure.get_facecolor(),
+                                metadata=SAVE_METADATA[file_format])
+
+    def _apply_layout(self) -> None:
+        if self._layout_stale:
+            self.figure.tight_layout(pad=self._artists.get("pad", 3))
+            self._layout_stale = False
+
+    # Bar chart: per-category totals in cents.
+
+    def _build_bar(self, data: list, labels: list, title: str) -> None:
+        values = cents_to_units(data)
+        ax = self.ax
+        bars = ax.bar(labels,
+                      values,
+                      color='#1E90FF',
+                      alpha=0.7,
+                      width=0.6)
+        texts = [
+            ax.text(bar.get_x() + bar.get_width() / 2., 0, '',
+                    ha='center',
+                    va='bottom',
+                    color='white',
+                    fontsize=10,
+                    fontweight='bold')
+            for bar in bars
+        ]
+        self._artists = {"labels": list(labels), "bars": bars, "texts": texts, "pad": 3}
+
         ax.set_xlabel("Category", fontsize=14, color='white', labelpad=15)
         ax.set_ylabel("Amount (USD)", fontsize=14, color='white', labelpad=15)
-        
-        plt.xticks(rotation=30, ha="right") 
-        
-        setup_figure_style(fig, ax, title)
-        plt.tight_layout(pad=3)
-        
-        display_chart(fig, parent)
-        
-    except Exception as e:
-        logging.error(f"Error plotting bar chart: {e}")
+        setp(ax.get_xticklabels(), rotation=30, ha="right")
 
+        setup_figure_style(self.figure, ax, title)
+        self._update_bar(data, labels, title)
 
-def plot_pie_chart(data: list, labels: list, title: str, parent) -> None:
-    try:
-        fig, ax = create_figure()
+    def _update_bar(self, data: list, labels: list, title: str) -> bool:
+        if self._artists.get("labels") != list(labels):
+            return False
+        values = cents_to_units(data)
+        top = values.max() if len(values) else 0
+        for bar, text, height in zip(self._artists["bars"], self._artists["texts"], values):
+            bar.set_height(height)
+            text.set_y(height + top * 0.02)
+            text.set_text(f'${height:,.0f}')
+        self.ax.set_ylim(0, top * 1.15 or 1)
+        self.ax.title.set_text(title)
+        return True
+
+    # Pie chart: per-category totals in cents.
+
+    def _build_pie(self, data: list, labels: list, title: str) -> None:
+        values = cents_to_units(data)
+        ax = self.ax
 
         # Color map with a number of distinct colors based on the data length
-        num_segments = len(data)
-        colors = plt.cm.tab20(np.linspace(0, 1, num_segments))
+        colors = matplotlib.colormaps["tab20"](np.linspace(0, 1, len(values)))
 
-        wedges, texts, autotexts = ax.pie(data,
-                                           labels=labels,
-                                           colors=colors,
-                                           autopct='%1.1f%%',
-                                           startangle=90,
-                                           pctdistance=0.75,
-                                           labeldistance=1.2)
+        wedges, texts, autotexts = ax.pie(values,
+                                          labels=labels,
+                                          colors=colors,
+                                          autopct='%1.1f%%',
+                                          startangle=PIE_START_ANGLE,
+                                          pctdistance=PIE_PCT_DISTANCE,
+                                          labeldistance=PIE_LABEL_DISTANCE)
 
-        plt.setp(autotexts, size=12, weight="bold", color="white")
-        plt.setp(texts, size=12, color="white")
+        setp(autotexts, size=12, weight="bold", color="white")
+        setp(texts, size=12, color="white")
 
         # Dark center circle
-        centre_circle = plt.Circle((0, 0), 0.40, fc='#1a1a1a')
-        ax.add_artist(centre_circle)
+        ax.add_artist(Circle((0, 0), 0.40, fc='#1a1a1a'))
 
-        total = sum(data)
-        ax.text(0, 0, f'Total\n${total:,.0f}',
-                ha='center',
-                va='center',
-                color='white',
-                fontsize=14,
-                fontweight='bold')
+        total = ax.text(0, 0, '',
+                        ha='center',
+                        va='center',
+                        color='white',
+                        fontsize=14,
+                        fontweight='bold')
 
-        setup_figure_style(fig, ax, title)
-        plt.tight_layout(pad=3.5)
+        self._artists = {
+            "labels": list(labels),
+            "wedges": wedges,
+            "texts": texts,
+            "autotexts": autotexts,
+            "total": total,
+            "pad": 3.5,
+        }
+        setup_figure_style(self.figure, ax, title)
+        self._update_pie(data, labels, title)
 
-        display_chart(fig, parent)
+    def _update_pie(self, data: list, labels: list, title: str) -> bool:
+        if self._artists.get("labels") != list(labels):
+            return False
+        values = cents_to_units(data)
+        total = values.sum()
+        fractions = values / total if total else np.zeros_like(values)
 
-    except Exception as e:
-        logging.error(f"Error plotting pie chart: {e}")
+        # Same geometry as Axes.pie: counter-clockwise from the start angle.
+        theta1 = PIE_START_ANGLE / 360
+        for wedge, text, autotext, fraction in zip(
+            self._artists["wedges"], self._artists["texts"], self._artists["autotexts"], fractions
+        ):
+            theta2 = theta1 + fraction
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+            middle = np.pi * (theta1 + theta2)
+            x, y = np.cos(middle), np.sin(middle)
+            text.set_position((PIE_LABEL_DISTANCE * x, PIE_LABEL_DISTANCE * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((PIE_PCT_DISTANCE * x, PIE_PCT_DISTANCE * y))
+            autotext.set_text(f'{100 * fraction:.1f}%')
+            theta1 = theta2
 
+        self._artists["total"].set_text(f'Total\n${total:,.0f}')
+        self.ax.title.set_text(title)
+        return True
+
+    # Line chart: (datetime64[D] dates, cents) arrays for income and expenses.
+
+    LINE_SERIES = (
+        ("income", "Income", '#4ECB71', (20, 35), 'bottom'),
+        ("expense", "Expenses", '#FF6B6B', (-25, -40), 'top'),
+    )
+
+    def _build_line(self, income_data: tuple, expense_data: tuple) -> None:
+        ax = self.ax
+        lines = {}
+        for (key, label, color, _, _), series in zip(self.LINE_SERIES, (income_data, expense_data)):
+            if series and len(series[0]) > 0:
+                lines[key], = ax.plot([], [],
+                                      label=label,
+                                      color=color,
+                                      linewidth=2,
+                                      marker='o',
+                                      markersize=8,
+                                      markerfacecolor=color,
+                                      markeredgecolor='white',
+                                      markeredgewidth=2)
+        self._artists = {"lines": lines, "annotations": [], "pad": 3}
 
-def plot_line_chart(income_data: tuple, expense_data: tuple, parent) -> None:
-    try:
-        fig, ax = create_figure()
-        
-        max_value = 0
-        
-        if income_data and len(income_data[0]) > 0:
-            dates = [datetime.strptime(date, "%d/%m/%Y").date() for date in income_data[0]]
-            ax.plot(dates, income_data[1],
-                   label="Income",
-                   color='#4ECB71',
-                   linewidth=2,
-                   marker='o',
-                   markersize=8,
-                   markerfacecolor='#4ECB71',
-                   markeredgecolor='white',
-                   markeredgewidth=2)
-            
-            for i, (x, y) in enumerate(zip(dates, income_data[1])):
-                offset = 20 if i % 2 == 0 else 35
-                ax.annotate(f'${y:,.0f}',
-                           (x, y),
-                           xytext=(0, offset),
-                           textcoords='offset points',
-                           ha='center',
-                           va='bottom',
-                           color='#4ECB71',
-                           fontsize=10,
-                           fontweight='bold')
-                max_value = max(max_value, y)
-
-        if expense_data and len(expense_data[0]) > 0:
-            dates = [datetime.strptime(date, "%d/%m/%Y").date() for date in expense_data[0]]
-            ax.plot(dates, expense_data[1],
-                   label="Expenses",
-                   color='#FF6B6B',
-                   linewidth=2,
-                   marker='o',
-                   markersize=8,
-                   markerfacecolor='#FF6B6B',
-                   markeredgecolor='white',
-                   markeredgewidth=2)
-            
-            for i, (x, y) in enumerate(zip(dates, expense_data[1])):
-                offset = -25 if i % 2 == 0 else -40
-                ax.annotate(f'${y:,.0f}',
-                           (x, y),
-                           xytext=(0, offset),
-                           textcoords='offset points',
-                           ha='center',
-                           va='top',
-                           color='#FF6B6B',
-                           fontsize=10,
-                           fontweight='bold')
-                max_value = max(max_value, y)
-
-        ax.set_ylim(0, max_value * 1.25)
-        
         ax.set_xlabel("Date", fontsize=14, color='white', labelpad=15)
         ax.set_ylabel("Amount (USD)", fontsize=14, color='white', labelpad=15)
-        
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-        
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%Y'))
-        plt.xticks(rotation=30, ha='right')
-        
-        legend = ax.legend(facecolor='#000000',
-                         edgecolor='gray',
-                         fontsize=12,
-                         loc='upper left',
-                         bbox_to_anchor=(0.02, 0.98),
-                         framealpha=0.9)
-        plt.setp(legend.get_texts(), color='white')
-        
-        setup_figure_style(fig, ax, "Income and Expenses Over Time")
-        plt.tight_layout(pad=3)
-        
-        display_chart(fig, parent)
-        
+
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
+
+        if lines:
+            # Register the date converter before the first set_data.
+            ax.xaxis.update_units(np.zeros(1, dtype="datetime64[D]"))
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%Y'))
+            setp(ax.get_xticklabels(), rotation=30, ha='right')
+
+            legend = ax.legend(facecolor='#000000',
+                               edgecolor='gray',
+                               fontsize=12,
+                               loc='upper left',
+                               bbox_to_anchor=(0.02, 0.98),
+                               framealpha=0.9)
+            setp(legend.get_texts(), color='white')
+
+        setup_figure_style(self.figure, ax, "Income and Expenses Over Time")
+        self._update_line(income_data, expense_data)
+
+    def _update_line(self, income_data: tuple, expense_data: tuple) -> bool:
+        present = {
+            key for (key, *_), series in zip(self.LINE_SERIES, (income_data, expense_data))
+            if series and len(series[0]) > 0
+        }
+        lines = self._artists.get("lines")
+        if lines is None or set(lines) != present:
+            return False
+
+        for annotation in self._artists["annotations"]:
+            annotation.remove()
+        annotations = self._artists["annotations"] = []
+
+        ax = self.ax
+        large = any(
+            len(series[0]) > self.large_series_points for series in (income_data, expense_data) if series
+        )
+        self._artists["large"] = large
+        # About one point per two pixels of plot width is as much detail as can be seen.
+        max_points = max(self.canvas.get_width_height()[0] // 2, 3)
+
+        max_value = 0
+        for (key, _, color, offsets, va), series in zip(self.LINE_SERIES, (income_data, expense_data)):
+            if key not in lines:
+                continue
+            # Already datetime64[D] from the data layer; this does not copy.
+            dates = np.asarray(series[0], dtype="datetime64[D]")
+            amounts = cents_to_units(series[1])
+            # Gap-filled buckets are zero; labelling them would only add clutter.
+            nonzero = np.flatnonzero(amounts)
+            if large:
+                keep = lttb(dates.astype(np.int64), amounts, max_points)
+                lines[key].set_data(dates[keep], amounts[keep])
+                lines[key].set_marker('None')
+                # Label the extrema and the latest point rather than every point.
+                values = amounts[nonzero]
+                labelled = sorted(
+                    {int(nonzero[values.argmax()]), int(nonzero[values.argmin()]), int(nonzero[-1])}
+                ) if len(nonzero) else []
+            else:
+                lines[key].set_data(dates, amounts)
+                lines[key].set_marker('o')
+                labelled = nonzero
+
+            for i in labelled:
+                annotations.append(ax.annotate(f'${amounts[i]:,.0f}',
+                                               (dates[i], amounts[i]),
+                                               xytext=(0, offsets[i % 2]),
+                                               textcoords='offset points',
+                                               ha='center',
+                                               va=va,
+                                               color=color,
+                                               fontsize=10,
+                                               fontweight='bold'))
+            max_value = max(max_value, amounts.max())
+
+        ax.relim()
+        ax.autoscale_view(scaley=False)
+        ax.set_ylim(0, max_value * 1.25 or 1)
+        return True
+
+
+class BitmapCache:
+    """LRU cache of rendered chart bitmaps, bounded in bytes.
+
+    Entries are keyed by the caller's key plus the pixel size and hold the
+    RGBA buffer together with the chart type and data it was drawn from, so
+    a hit can be shown without touching matplotlib.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_BITMAP_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Hashable, size: Tuple[int, int]) -> Optional[tuple]:
+        """Return (chart_type, data, rgba) for ``key`` at ``size``, or None."""
+        entry = self._entries.get((key, size))
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((key, size))
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, size: Tuple[int, int], chart_type: str, data: tuple, rgba: bytes) -> None:
+        if len(rgba) > self.max_bytes:
+            return
+        previous = self._entries.pop((key, size), None)
+        if previous is not None:
+            self._size -= len(previous[2])
+        self._entries[(key, size)] = (chart_type, data, rgba)
+        self._size += len(rgba)
+        while self._size > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+class ChartSurface:
+    """A chart slot inside a Tk container: one ChartFigure shown through one Tk image.
+
+    Drawing happens on a single background worker, so a heavy chart never
+    blocks input handling; the Tk thread only pastes the finished RGBA
+    buffer into a reused PhotoImage. A newer render request supersedes an
+    older one: if the old one has not started it is skipped, otherwise its
+    result is dropped. The figure is only ever touched by that worker.
+
+    Resizing only redraws the data already shown, and while the user drags,
+    intermediate sizes are dropped and the last image stays on screen until
+    the size settles.
+
+    Renders shown with a ``cache_key`` are kept in a BitmapCache, and
+    ``show_cached`` blits them back without drawing. The key must change
+    whenever the data behind it may have changed.
+    """
+
+    def __init__(self, parent) -> None:
+        self.parent = parent
+        self.chart = ChartFigure()
+        self.renderer = TaskRunner(parent, max_workers=1)
+        self.label = tk.Label(parent, bg=BACKGROUND_COLOR, bd=0, highlightthickness=0)
+        self.label.pack(fill="both", expand=True, padx=CHART_PADDING, pady=CHART_PADDING)
+        # The image must not dictate the container's size, or resizes would feed back.
+        parent.pack_propagate(False)
+        parent.bind("<Configure>", self._on_configure, add="+")
+        self.photo = None
+        self.cache = BitmapCache()
+        self._resize_id = None
+        self._cache_key = None
+        # The (chart_type, data) on screen or being drawn, and its pixel size.
+        self._current = None
+        self._size = None
+
+    def target_size(self) -> Tuple[int, int]:
+        """Pixel size available for the chart inside the parent."""
+        width = self.parent.winfo_width() - 2 * CHART_PADDING
+        height = self.parent.winfo_height() - 2 * CHART_PADDING
+        if width < 50 or height < 50:
+            return DEFAULT_SIZE
+        return width, height
+
+    def show(self, chart_type: str, data: tuple, cache_key: Optional[Hashable] = None) -> None:
+        """Draw ``data`` in the background and show it when done."""
+        self._cancel_resize()
+        self._cache_key = cache_key
+        self._current = (chart_type, data)
+        self._request_render(self.target_size())
+
+    def show_cached(self, cache_key: Hashable) -> bool:
+        """Show the cached bitmap for ``cache_key`` at the current size, if there is one."""
+        size = self.target_size()
+        entry = self.cache.get(cache_key, size)
+        if entry is None:
+            return False
+        self._cancel_resize()
+        self.renderer.cancel("render")
+        chart_type, data, rgba = entry
+        self._current = (chart_type, data)
+        self._cache_key = cache_key
+        self._size = size
+        self.present(*size, rgba)
+        return True
+
+    def close(self) -> None:
+        """Stop the render worker."""
+        self._cancel_resize()
+        self.renderer.shutdown()
+
+    def _request_render(self, size: Tuple[int, int]) -> None:
+        chart, (chart_type, data), cache_key = self.chart, self._current, self._cache_key
+
+        def render(task):
+            chart.resize(*size)
+            chart.update(chart_type, data)
+            task.raise_if_cancelled()
+            return chart.render()
+
+        def on_success(result):
+            width, height, rgba = result
+            if cache_key is not None:
+                self.cache.put(cache_key, (width, height), chart_type, data, rgba)
+            self.present(width, height, rgba)
+
+        def on_error(e):
+            logging.error(f"Error rendering {chart_type} chart: {e}")
+            show_chart_error(self.parent, e)
+
+        self._size = size
+        self.renderer.submit(render, on_success, on_error, key="render")
+
+    def _on_configure(self, event) -> None:
+        """Schedule a redraw at the new size, replacing any pending one."""
+        if self._current is None:
+            return
+        self._cancel_resize()
+        self._resize_id = self.label.after(RESIZE_SETTLE_MS, self._render_resized)
+
+    def _cancel_resize(self) -> None:
+        if self._resize_id is not None:
+            self.label.after_cancel(self._resize_id)
+            self._resize_id = None
+
+    def _render_resized(self) -> None:
+        """Redraw the current chart at the settled size; no data is refetched."""
+        self._resize_id = None
+        size = self.target_size()
+        if size == self._size:
+            return
+        if self._cache_key is not None and self.show_cached(self._cache_key):
+            return
+        self._request_render(size)
+
+    def present(self, width: int, height: int, rgba: bytes) -> None:
+        """Blit a rendered RGBA buffer into the Tk image."""
+        image = Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1)
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == (width, height):
+            self.photo.paste(image)
+        else:
+            self.photo = ImageTk.PhotoImage(image, master=self.label)
+            self.label.configure(image=self.photo)
+
+
+_surfaces = {}
+
+
+def get_chart_surface(parent) -> ChartSurface:
+    """Return the persistent surface for a container, creating it on first use."""
+    key = str(parent)
+    surface = _surfaces.get(key)
+    if surface is None or not surface.label.winfo_exists():
+        if surface is not None:
+            surface.close()
+        surface = _surfaces[key] = ChartSurface(parent)
+    return surface
+
+
+def close_chart_surfaces() -> None:
+    """Stop every chart surface's render worker; call once the main loop has ended."""
+    for surface in _surfaces.values():
+        surface.close()
+    _surfaces.clear()
+
+
+def show_cached_chart(parent, cache_key: Hashable) -> bool:
+    """Blit a previously rendered chart for ``cache_key``; False if none is cached at this size."""
+    try:
+        return get_chart_surface(parent).show_cached(cache_key)
     except Exception as e:
-        logging.error(f"Error plotting line chart: {e}")
+        logging.error(f"Error showing cached chart: {e}")
+        return False
+
 
-def display_chart(fig: Figure, parent) -> None:
+def plot_bar_chart(data: list, labels: list, title: str, parent, cache_key: Optional[Hashable] = None) -> None:
+    """Plot per-category totals given in cents."""
     try:
-        for widget in parent.winfo_children():
-            widget.destroy()
-        
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(fill="both", expand=True, padx=15, pady=15)
-        
-        def on_resize(event):
-            if abs(event.width - fig.get_size_inches()[0] * fig.dpi) > 50 or \
-               abs(event.height - fig.get_size_inches()[1] * fig.dpi) > 50:
-                width = event.width / fig.dpi
-                height = event.height / fig.dpi
-                fig.set_size_inches(width, height)
-                canvas.draw_idle()
-        
-        canvas_widget.bind('<Configure>', on_resize)
-        
+        get_chart_surface(parent).show("bar", (data, labels, title), cache_key)
     except Exception as e:
-        logging.error(f"Error displaying chart: {e}")
-        error_label = ctk.CTkLabel(
-            parent,
-            text=f"Error displaying chart: {str(e)}",
-            text_color="red"
-        )
-        error_label.pack(pady=20)
\ No newline at end of file
+        logging.error(f"Error plotting bar chart: {e}")
+        show_chart_error(parent, e)
+
+
+def plot_pie_chart(data: list, labels: list, title: str, parent, cache_key: Optional[Hashable] = None) -> None:
+    """Plot per-category totals given in cents."""
+    try:
+        get_chart_surface(parent).show("pie", (data, labels, title), cache_key)
+    except Exception as e:
+        logging.error(f"Error plotting pie chart: {e}")
+        show_chart_error(parent, e)
+
+
+def plot_line_chart(income_data: tuple, expense_data: tuple, parent, cache_key: Optional[Hashable] = None) -> None:
+    """Plot (datetime64[D] dates, cents) array pairs for income and expenses over time."""
+    try:
+        get_chart_surface(parent).show("line", (income_data, expense_data), cache_key)
+    except Exception as e:
+        logging.error(f"Error plotting line chart: {e}")
+        show_chart_error(parent, e)
+
+
+def show_chart_error(parent, error: Exception) -> None:
+    error_label = ctk.CTkLabel(
+        parent,
+        text=f"Error displaying chart: {str(error)}",
+        text_color="red"
+    )
+    error_label.place(relx=0.5, rely=0.5, anchor="center")
+    error_label.after(5000, error_label.destroy)
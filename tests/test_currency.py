@@ -0,0 +1,134 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from src.utils.Currency import FileRateProvider, RateProvider, RateService
+from src.utils.Database import create_or_open_database, insert_transactions
+from src.utils.Money import Money
+from src.utils.Summary import compute_summary, compute_time_series
+
+
+class RecordingRunner:
+    """Stands in for TaskRunner: records submissions without running them."""
+
+    def __init__(self):
+        self.keys = []
+
+    def submit(self, func, on_success=None, on_error=None, key=None):
+        self.keys.append(key)
+
+
+class RateServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.rates_file = os.path.join(self.directory.name, "rates.json")
+        self.write_rates({"base": "USD", "rates": {"EUR": 0.5, "GBP": 0.25}})
+        self.conn = create_or_open_database(":memory:")
+        self.service = RateService(FileRateProvider(self.rates_file))
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def write_rates(self, payload) -> None:
+        with open(self.rates_file, "w", encoding="utf-8") as rates_file:
+            json.dump(payload, rates_file)
+
+    def refresh(self) -> bool:
+        with redirect_stdout(StringIO()):
+            return self.service.refresh(self.conn)
+
+    def test_provider_must_implement_fetch(self):
+        with self.assertRaises(TypeError):
+            RateProvider()
+
+    def test_cross_rates_go_through_the_base(self):
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.service.rate("EUR", "GBP"), 0.5)
+        self.assertEqual(self.service.rate("GBP", "USD"), 4.0)
+        self.assertEqual(self.service.convert(Money(1001), "EUR", "GBP"), Money(501))
+        with self.assertRaises(ValueError):
+            self.service.rate("EUR", "JPY")
+
+    def test_rates_round_trip_through_the_database(self):
+        self.assertFalse(RateService(FileRateProvider(self.rates_file)).load(self.conn))
+        self.refresh()
+        loaded = RateService(FileRateProvider(os.path.join(self.directory.name, "missing.json")))
+        self.assertTrue(loaded.load(self.conn))
+        self.assertEqual(loaded.rate("USD", "EUR"), 0.5)
+        self.assertEqual(loaded.fetched_at, self.service.fetched_at)
+
+    def test_staleness_follows_the_ttl(self):
+        self.assertTrue(self.service.is_stale())
+        self.refresh()
+        self.assertFalse(self.service.is_stale())
+        with self.conn:
+            self.conn.execute("UPDATE exchange_rates SET fetched_at = ?", (int(time.time()) - 3600,))
+        aged = RateService(FileRateProvider(self.rates_file), ttl_seconds=1800)
+        aged.load(self.conn)
+        self.assertTrue(aged.is_stale())
+
+    def test_failed_refresh_keeps_the_last_known_rates(self):
+        self.refresh()
+        for payload in ([1, 2], {"base": "USD"}, {"rates": {"EUR": "x"}}, {"rates": {"EUR": 0}}):
+            with self.subTest(payload=payload):
+                self.write_rates(payload)
+                self.assertFalse(self.refresh())
+                self.assertIsNotNone(self.service.last_error)
+                self.assertEqual(self.service.rate("USD", "EUR"), 0.5)
+
+    def test_failed_refresh_is_not_retried_at_once(self):
+        os.remove(self.rates_file)
+        self.assertFalse(self.refresh())
+        runner = RecordingRunner()
+        self.service.refresh_in_background(runner)
+        self.assertEqual(runner.keys, [])
+
+
+class ConvertedChartDataTest(unittest.TestCase):
+    """Charts and reports show mixed-currency accounts in one currency, like the summary."""
+
+    def setUp(self):
+        self.conn = create_or_open_database(":memory:")
+        self.conn.execute("INSERT INTO accounts (username, password) VALUES ('alice', 'x')")
+        self.conn.commit()
+        rows = [
+            ("income", "Salary", "10.00", "2024-01-01", "USD"),
+            ("income", "Salary", "10.00", "2024-01-03", "EUR"),
+            ("expense", "Rent", "5.00", "2024-02-10", "EUR"),
+        ]
+        insert_transactions(
+            self.conn,
+            [
+                {"account": "alice", "type": kind, "category": category, "amount": amount, "date": day, "currency": cur}
+                for kind, category, amount, day, cur in rows
+            ],
+        )
+        # Only the stored history is used; nothing is fetched.
+        self.rates = RateService(FileRateProvider(os.devnull))
+        self.rates.store_history(self.conn, "2024-01-01", {"EUR": 0.5})
+        self.rates.store_history(self.conn, "2024-02-01", {"EUR": 0.25})
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_series_are_converted_at_each_days_rate(self):
+        dates, income, expenses = compute_time_series(self.conn, 1, "month", self.rates)
+        self.assertEqual([str(day) for day in dates], ["2024-01-01", "2024-02-01"])
+        self.assertEqual((income.tolist(), expenses.tolist()), ([3000, 0], [0, 2000]))
+
+    def test_chart_totals_match_the_summary(self):
+        summary = compute_summary(self.conn, 1, self.rates)
+        self.assertEqual(summary.category_series("income"), ([3000], ["Salary"]))
+        self.assertEqual(summary.category_series("expense"), ([2000], ["Rent"]))
+        _, income, expenses = compute_time_series(self.conn, 1, "year", self.rates)
+        self.assertEqual((income.sum(), expenses.sum()), (summary.income.cents, summary.expenses.cents))
+
+
+if __name__ == "__main__":
+    unittest.main()
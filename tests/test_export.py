@@ -0,0 +1,114 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from src.utils.Database import create_or_open_database, insert_transactions
+from src.utils.Export import export_transactions
+
+
+class IncrementalExportTest(unittest.TestCase):
+    """An incremental export must always leave the same file as a full one."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.conn = create_or_open_database(os.path.join(self.directory.name, "export.db"))
+        self.conn.execute("INSERT INTO accounts (username, password) VALUES ('alice', 'x')")
+        self.conn.commit()
+        self.add(("Salary", "1000.00", "2024-01-31"), ("Bonus", "250.50", "2024-02-15"))
+        self.incremental = os.path.join(self.directory.name, "incremental.csv")
+        self.full = os.path.join(self.directory.name, "full.csv")
+        self.export()
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def add(self, *rows):
+        inserted, errors = insert_transactions(
+            self.conn,
+            [
+                {"account": "alice", "type": "income", "category": category, "amount": amount, "date": day}
+                for category, amount, day in rows
+            ],
+        )
+        self.assertEqual((inserted, errors), (len(rows), []))
+
+    def export(self) -> str:
+        """Export incrementally and return what was printed."""
+        with redirect_stdout(StringIO()) as output:
+            export_transactions(self.conn, 1, "income", self.incremental, incremental=True)
+        return output.getvalue()
+
+    def assertMatchesFullExport(self):
+        with redirect_stdout(StringIO()):
+            export_transactions(self.conn, 1, "income", self.full)
+        with open(self.incremental, "rb") as incremental, open(self.full, "rb") as full:
+            self.assertEqual(incremental.read(), full.read())
+
+    def test_new_rows_are_appended(self):
+        self.add(("Salary", "1000.00", "2024-02-29"), ("Gift", "20.00", "2024-03-01"))
+        self.assertTrue(self.export().startswith("Appended 2 income rows"))
+        self.assertMatchesFullExport()
+
+    def test_backdated_row_rewrites(self):
+        self.add(("Refund", "5.00", "2024-01-01"))
+        self.assertTrue(self.export().startswith("Exported 3 income rows"))
+        self.assertMatchesFullExport()
+
+    def test_edits_and_deletes_rewrite(self):
+        for statement in (
+            "UPDATE transactions SET amount = 99 WHERE category = 'Bonus'",
+            "DELETE FROM transactions WHERE category = 'Salary'",
+        ):
+            with self.subTest(statement=statement):
+                with self.conn:
+                    self.conn.execute(statement)
+                self.assertTrue(self.export().startswith("Exported"))
+                self.assertMatchesFullExport()
+
+    def test_changed_file_rewrites(self):
+        with open(self.incremental, "a", encoding="utf-8") as csvfile:
+            csvfile.write("stray line\n")
+        self.add(("Gift", "20.00", "2024-03-01"))
+        self.assertTrue(self.export().startswith("Exported 3 income rows"))
+        self.assertMatchesFullExport()
+
+    def test_unchanged_account_appends_nothing(self):
+        self.assertTrue(self.export().startswith("Appended 0 income rows"))
+        self.assertMatchesFullExport()
+
+
+@unittest.skipIf(os.name == "nt", "POSIX file modes")
+class ExportFileModeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.conn = create_or_open_database(":memory:")
+        self.filename = os.path.join(self.directory.name, "income.csv")
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def export(self) -> int:
+        with redirect_stdout(StringIO()):
+            export_transactions(self.conn, 1, "income", self.filename)
+        return os.stat(self.filename).st_mode & 0o777
+
+    def test_new_file_follows_umask(self):
+        umask = os.umask(0o027)
+        try:
+            self.assertEqual(self.export(), 0o640)
+        finally:
+            os.umask(umask)
+
+    def test_replaced_file_keeps_its_mode(self):
+        self.export()
+        os.chmod(self.filename, 0o640)
+        self.assertEqual(self.export(), 0o640)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import unittest
+from decimal import Decimal
+
+from src.utils.Money import Money, cents_to_units
+
+
+class MoneyTest(unittest.TestCase):
+    def test_parse_rounds_half_up_to_the_cent(self):
+        self.assertEqual(Money.parse("0.005").cents, 1)
+        self.assertEqual(Money.parse("2.675").cents, 268)
+        self.assertEqual(Money.parse("-1.005").cents, -101)
+        self.assertEqual(Money.parse(" 12.5 ").cents, 1250)
+
+    def test_parse_accepts_numbers(self):
+        self.assertEqual(Money.parse(3).cents, 300)
+        self.assertEqual(Money.parse(0.1).cents, 10)
+        self.assertEqual(Money.parse(Decimal("19.99")).cents, 1999)
+
+    def test_parse_rejects_non_numbers(self):
+        for value in ("", "abc", "1,000", "NaN", "Infinity", "1e30"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    Money.parse(value)
+
+    def test_sums_are_exact(self):
+        total = Money(0)
+        for _ in range(10):
+            total = total + Money.parse("0.1")
+        self.assertEqual(total, Money(100))
+        self.assertEqual(Money(100) - Money(250), Money(-150))
+
+    def test_formatting(self):
+        self.assertEqual(str(Money(123456)), "1234.56")
+        self.assertEqual(str(Money(-5)), "-0.05")
+        self.assertEqual(f"${Money(1999):.2f}", "$19.99")
+        self.assertEqual(Money(1999).to_decimal(), Decimal("19.99"))
+
+    def test_cents_to_units(self):
+        self.assertEqual(cents_to_units([150, -1]).tolist(), [1.5, -0.01])
+
+
+if __name__ == "__main__":
+    unittest.main()
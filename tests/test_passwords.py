@@ -0,0 +1,41 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from src.utils.Database import (
+    DEFAULT_BCRYPT_ROUNDS,
+    _bcrypt_rounds_from_env,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
+
+
+class PasswordTest(unittest.TestCase):
+    def test_hash_round_trip_and_rehash_check(self):
+        hashed = hash_password("secret", rounds=4)
+        self.assertTrue(verify_password("secret", hashed))
+        self.assertFalse(verify_password("wrong", hashed))
+        self.assertFalse(password_needs_rehash(hashed, rounds=4))
+        self.assertTrue(password_needs_rehash(hashed, rounds=5))
+        self.assertTrue(password_needs_rehash(b"not a bcrypt hash"))
+
+    def test_rounds_come_from_the_environment_when_valid(self):
+        cases = {
+            None: DEFAULT_BCRYPT_ROUNDS,
+            "10": 10,
+            "abc": DEFAULT_BCRYPT_ROUNDS,
+            "3": DEFAULT_BCRYPT_ROUNDS,
+            "32": DEFAULT_BCRYPT_ROUNDS,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                environ = {} if value is None else {"BUDGET_TRACKER_BCRYPT_ROUNDS": value}
+                with mock.patch.dict("os.environ", environ, clear=True), redirect_stdout(StringIO()):
+                    self.assertEqual(_bcrypt_rounds_from_env(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
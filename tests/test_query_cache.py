@@ -0,0 +1,72 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.utils.Database import QueryCache, _estimate_size, create_or_open_database
+
+COUNT_SQL = "SELECT COUNT(*) FROM accounts"
+
+
+class QueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.db")
+        self.conn = create_or_open_database(self.path)
+        self.cache = QueryCache(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def add_account(self, conn, username: str) -> None:
+        with conn:
+            conn.execute("INSERT INTO accounts (username, password) VALUES (?, 'x')", (username,))
+
+    def test_repeated_query_is_a_hit(self):
+        self.assertEqual(self.cache.fetchone(COUNT_SQL), (0,))
+        # Whitespace differences do not make a new entry.
+        self.assertEqual(self.cache.fetchone("SELECT  COUNT(*)\n FROM accounts"), (0,))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_write_on_the_same_connection_invalidates(self):
+        self.cache.fetchone(COUNT_SQL)
+        self.add_account(self.conn, "alice")
+        self.assertEqual(self.cache.fetchone(COUNT_SQL), (1,))
+        self.assertEqual((self.cache.misses, self.cache.invalidations), (2, 1))
+
+    def test_commit_from_another_connection_invalidates(self):
+        self.cache.fetchone(COUNT_SQL)
+        other = sqlite3.connect(self.path)
+        try:
+            self.add_account(other, "bob")
+        finally:
+            other.close()
+        self.assertEqual(self.cache.fetchone(COUNT_SQL), (1,))
+        self.assertEqual((self.cache.misses, self.cache.invalidations), (2, 1))
+
+    def test_least_recently_used_entry_is_evicted_by_size(self):
+        queries = [f"SELECT {n}" for n in range(3)]
+        entry_size = _estimate_size(self.conn.execute(queries[0]).fetchall())
+        cache = QueryCache(self.conn, max_bytes=2 * entry_size)
+        cache.fetchall(queries[0])
+        cache.fetchall(queries[1])
+        cache.fetchall(queries[0])  # Now the most recently used.
+        cache.fetchall(queries[2])
+        self.assertEqual((cache.evictions, cache.stats()["entries"]), (1, 2))
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+
+        cache.fetchall(queries[0])
+        cache.fetchall(queries[1])
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_result_larger_than_the_cache_is_not_kept(self):
+        cache = QueryCache(self.conn, max_bytes=1)
+        self.assertEqual(cache.fetchall("SELECT 1"), [(1,)])
+        self.assertEqual((cache.stats()["entries"], cache.evictions), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
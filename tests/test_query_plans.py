@@ -0,0 +1,55 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import sqlite3
+import unittest
+
+from src.utils.Database import (
+    MIGRATIONS,
+    capture_queries,
+    create_or_open_database,
+    fetch_time_series,
+    find_full_scans,
+    get_schema_version,
+    hot_queries,
+    run_migrations,
+)
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_or_open_database(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_migrations_reach_latest_version(self):
+        self.assertEqual(get_schema_version(self.conn), MIGRATIONS[-1][0])
+
+    def test_migrations_are_idempotent(self):
+        run_migrations(self.conn)
+        self.assertEqual(get_schema_version(self.conn), MIGRATIONS[-1][0])
+
+    def test_hot_queries_use_an_index(self):
+        self.assertEqual(find_full_scans(self.conn), [])
+
+    def test_full_scan_is_reported(self):
+        query = "SELECT id FROM transactions WHERE category = ?"
+        self.assertEqual([found for found, _ in find_full_scans(self.conn, [query])], [query])
+
+    def test_subquery_scans_are_not_reported(self):
+        query = "SELECT * FROM (SELECT date, SUM(amount) FROM transactions WHERE account_id = 1 GROUP BY date)"
+        self.assertEqual(find_full_scans(self.conn, [query]), [])
+
+    def test_hot_queries_come_from_the_real_builders(self):
+        queries = hot_queries(self.conn)
+        series = capture_queries(
+            self.conn, lambda: fetch_time_series(self.conn, 1, "month", "2024-01-01", "2024-12-31")
+        )
+        self.assertEqual(len(series), 1)
+        self.assertIn(series[0], queries)
+        for table in ("transactions", "transaction_rollups", "transaction_changes", "export_watermarks"):
+            with self.subTest(table=table):
+                self.assertTrue(any(f"FROM {table} " in query for query in queries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import unittest
+
+from src.utils.Database import (
+    create_or_open_database,
+    fetch_category_totals,
+    insert_transactions,
+    rebuild_rollups,
+)
+
+
+class RollupTriggerTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_or_open_database(":memory:")
+        self.conn.executemany("INSERT INTO accounts (username, password) VALUES (?, 'x')", [("alice",), ("bob",)])
+        self.conn.commit()
+        rows = [
+            ("alice", "income", "Salary", "1000.00", "2024-01-31"),
+            ("alice", "income", "Salary", "1000.00", "2024-02-29"),
+            ("alice", "expense", "Rent", "500.25", "2024-01-01"),
+            ("alice", "expense", "Food", "12.10", "2024-01-15"),
+            ("bob", "expense", "Food", "3.00", "2024-01-15"),
+        ]
+        inserted, errors = insert_transactions(
+            self.conn,
+            [
+                {"account": account, "type": kind, "category": category, "amount": amount, "date": day}
+                for account, kind, category, amount, day in rows
+            ],
+        )
+        self.assertEqual((inserted, errors), (len(rows), []))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def assertNoDrift(self):
+        self.assertEqual(rebuild_rollups(self.conn), [])
+
+    def test_inserts_are_rolled_up(self):
+        self.assertNoDrift()
+        self.assertEqual(fetch_category_totals(self.conn, 1, "income"), ([200000], ["Salary"]))
+        self.assertEqual(fetch_category_totals(self.conn, 1, "income", "2024-02"), ([100000], ["Salary"]))
+        self.assertEqual(fetch_category_totals(self.conn, 1, "expense"), ([1210, 50025], ["Food", "Rent"]))
+
+    def test_updates_move_amounts_between_keys(self):
+        with self.conn:
+            self.conn.execute("UPDATE transactions SET amount = amount + 1 WHERE category = 'Rent'")
+            self.conn.execute("UPDATE transactions SET category = 'Groceries' WHERE category = 'Food'")
+            self.conn.execute("UPDATE transactions SET date = '2024-03-01' WHERE date = '2024-02-29'")
+            self.conn.execute("UPDATE transactions SET account_id = 2 WHERE category = 'Rent'")
+        self.assertNoDrift()
+        self.assertEqual(fetch_category_totals(self.conn, 2, "expense"), ([300, 50026], ["Groceries", "Rent"]))
+        self.assertEqual(fetch_category_totals(self.conn, 1, "income", "2024-03"), ([100000], ["Salary"]))
+
+    def test_deletes_remove_empty_keys(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM transactions WHERE category = 'Food'")
+        self.assertNoDrift()
+        self.assertEqual(fetch_category_totals(self.conn, 1, "expense"), ([50025], ["Rent"]))
+        self.assertEqual(fetch_category_totals(self.conn, 2, "expense"), ([], []))
+
+    def test_rebuild_reports_drift(self):
+        with self.conn:
+            self.conn.execute("UPDATE transaction_rollups SET total = total + 1 WHERE category = 'Rent'")
+        self.assertEqual(len(rebuild_rollups(self.conn)), 1)
+        self.assertNoDrift()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.utils.Tasks import TaskRunner
+
+
+class FakeRoot:
+    """Stands in for the Tk root: ``after`` callbacks run when the test pumps them."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay_ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def pump(self, runner, timeout=5.0):
+        """Run scheduled callbacks until the runner has delivered everything."""
+        deadline = time.monotonic() + timeout
+        while self.callbacks:
+            if time.monotonic() > deadline:
+                raise AssertionError("Background tasks did not finish in time.")
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            if runner._pending:
+                time.sleep(0.005)
+
+
+class TaskRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.runner = TaskRunner(self.root, max_workers=2)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_results_and_errors_reach_callbacks(self):
+        results, errors = [], []
+        self.runner.submit(lambda task: 42, results.append, errors.append)
+        self.runner.submit(lambda task: 1 / 0, results.append, errors.append)
+        self.root.pump(self.runner)
+        self.assertEqual(results, [42])
+        self.assertEqual([type(e) for e in errors], [ZeroDivisionError])
+
+    def test_same_key_delivers_only_the_latest_result(self):
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def slow(task):
+            started.set()
+            release.wait(5)
+            return "old"
+
+        self.runner.submit(slow, results.append, key="summary")
+        started.wait(5)
+        self.runner.submit(lambda task: "new", results.append, key="summary")
+        release.set()
+        self.root.pump(self.runner)
+        self.assertEqual(results, ["new"])
+
+    def test_superseded_task_can_stop_early(self):
+        started, release = threading.Event(), threading.Event()
+        seen = []
+
+        def cooperative(task):
+            started.set()
+            release.wait(5)
+            seen.append(task.cancelled)
+            task.raise_if_cancelled()
+            return "finished"
+
+        results = []
+        self.runner.submit(cooperative, results.append, key="chart")
+        started.wait(5)
+        self.runner.cancel("chart")
+        release.set()
+        self.root.pump(self.runner)
+        self.assertEqual((seen, results), ([True], []))
+
+    def test_each_worker_gets_its_own_connection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            runner = TaskRunner(self.root, os.path.join(directory, "tasks.db"), max_workers=1)
+            try:
+                results = []
+                runner.submit(lambda task: task.db.execute("SELECT 1").fetchone()[0], results.append)
+                runner.submit(lambda task: task.cache.conn is task.db, results.append)
+                self.root.pump(runner)
+                self.assertEqual(results, [1, True])
+            finally:
+                runner.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
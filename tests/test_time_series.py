@@ -0,0 +1,100 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import unittest
+
+import numpy as np
+
+from src.utils.Database import capture_queries, create_or_open_database, fetch_time_series, insert_transactions
+from src.utils.Visualization import lttb
+
+
+class TimeSeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_or_open_database(":memory:")
+        self.conn.execute("INSERT INTO accounts (username, password) VALUES ('alice', 'x')")
+        self.conn.commit()
+        rows = [
+            ("income", "1.00", "2024-01-03"),  # Wednesday
+            ("expense", "2.00", "2024-01-07"),  # Sunday, same week
+            ("income", "4.00", "2024-01-08"),  # Monday, next week
+            ("expense", "8.00", "2024-03-31"),
+        ]
+        inserted, errors = insert_transactions(
+            self.conn,
+            [
+                {"account": "alice", "type": kind, "category": "c", "amount": amount, "date": day}
+                for kind, amount, day in rows
+            ],
+        )
+        self.assertEqual((inserted, errors), (len(rows), []))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def series(self, bucket: str, start_date=None, end_date=None) -> tuple:
+        dates, income, expenses = fetch_time_series(self.conn, 1, bucket, start_date, end_date)
+        return [str(day) for day in dates], income.tolist(), expenses.tolist()
+
+    def test_weeks_start_on_monday(self):
+        dates, income, expenses = self.series("week", end_date="2024-01-14")
+        self.assertEqual(dates, ["2024-01-01", "2024-01-08"])
+        self.assertEqual((income, expenses), ([100, 400], [200, 0]))
+
+    def test_gaps_are_filled_with_zeros(self):
+        dates, income, expenses = self.series("day", end_date="2024-01-08")
+        self.assertEqual(dates, [f"2024-01-{day:02d}" for day in range(3, 9)])
+        self.assertEqual((income, expenses), ([100, 0, 0, 0, 0, 400], [0, 0, 0, 0, 200, 0]))
+        dates, income, expenses = self.series("month")
+        self.assertEqual(dates, ["2024-01-01", "2024-02-01", "2024-03-01"])
+        self.assertEqual((income, expenses), ([500, 0, 0], [200, 0, 800]))
+
+    def test_bounds_limit_rows_and_span_the_axis(self):
+        dates, income, expenses = self.series("day", "2024-01-05", "2024-01-09")
+        self.assertEqual(dates, [f"2024-01-{day:02d}" for day in range(5, 10)])
+        self.assertEqual((income, expenses), ([0, 0, 0, 400, 0], [0, 0, 200, 0, 0]))
+        # Saturday to Monday touches three weeks, each labelled by its Monday.
+        self.assertEqual(
+            self.series("week", "2024-06-01", "2024-06-10"),
+            (["2024-05-27", "2024-06-03", "2024-06-10"], [0, 0, 0], [0, 0, 0]),
+        )
+
+    def test_whole_months_read_the_rollups(self):
+        for bucket in ("month", "year"):
+            for bounds, table in (
+                ((None, None), "transaction_rollups"),
+                (("2024-01-01", "2024-03-31"), "transaction_rollups"),
+                (("2024-01-05", "2024-03-31"), "transactions"),
+                (("2024-01-01", "2024-03-30"), "transactions"),
+            ):
+                with self.subTest(bucket=bucket, bounds=bounds):
+                    queries = capture_queries(self.conn, lambda: self.series(bucket, *bounds))
+                    self.assertIn(f"FROM {table} WHERE", queries[0])
+
+    def test_rollup_and_raw_paths_agree(self):
+        whole = self.series("month", "2024-01-01", "2024-03-31")
+        # Same rows, but a range the rollups cannot answer.
+        raw = self.series("month", "2024-01-01", "2024-04-01")
+        self.assertEqual(whole, (raw[0][:3], raw[1][:3], raw[2][:3]))
+        self.assertEqual(raw[0][3:], ["2024-04-01"])
+
+
+class LttbTest(unittest.TestCase):
+    def test_keeps_endpoints_and_threshold_points_in_order(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(1000)
+        y = rng.normal(size=1000).cumsum()
+        keep = lttb(x, y, 50)
+        self.assertEqual(len(keep), 50)
+        self.assertEqual((keep[0], keep[-1]), (0, 999))
+        self.assertTrue(np.all(np.diff(keep) > 0))
+
+    def test_keeps_a_spike(self):
+        y = np.zeros(500)
+        y[250] = 100.0
+        self.assertIn(250, lttb(np.arange(500), y, 20))
+
+    def test_short_series_are_kept_whole(self):
+        self.assertEqual(lttb(np.arange(10), np.arange(10), 20).tolist(), list(range(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
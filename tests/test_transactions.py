@@ -0,0 +1,49 @@
+"""Run from the repository root: python -m unittest discover tests"""
+import unittest
+
+from src.utils.Database import create_or_open_database, insert_transactions
+
+
+class InsertTransactionsTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_or_open_database(":memory:")
+        self.conn.execute("INSERT INTO accounts (username, password) VALUES ('alice', 'x')")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def row(self, **overrides) -> dict:
+        row = {"account": "alice", "type": "expense", "category": "Food", "amount": "1.50", "date": "2024-01-15"}
+        row.update(overrides)
+        return row
+
+    def test_currency_is_normalised(self):
+        self.assertEqual(insert_transactions(self.conn, [self.row(currency=" eur ")]), (1, []))
+        self.assertEqual(self.conn.execute("SELECT currency FROM transactions").fetchone(), ("EUR",))
+
+    def test_malformed_rows_are_reported_not_raised(self):
+        rows = [
+            self.row(),
+            self.row(currency=978),
+            ("alice", "expense", "Food", "1.50", "2024-01-15"),
+            None,
+            self.row(account=["alice"]),
+            self.row(account_id="1"),
+            self.row(category=7),
+            self.row(amount="1e30"),
+            self.row(amount="1e20"),
+            self.row(date="2024-W01-1"),
+            self.row(date="20240101  "),
+            self.row(date="2024-02-30"),
+            self.row(),
+        ]
+        inserted, errors = insert_transactions(self.conn, rows)
+        self.assertEqual(inserted, 2)
+        self.assertEqual([index for index, _ in errors], list(range(1, 12)))
+        self.assertIn("Invalid currency code: 978", errors[0][1])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone(), (2,))
+
+
+if __name__ == "__main__":
+    unittest.main()